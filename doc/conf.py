@@ -36,6 +36,9 @@ extensions = [
     "sphinx.ext.viewcode",
 ]
 
+# Optional dependencies, not required to build the documentation
+autodoc_mock_imports = ["numpy", "pandas", "pyarrow"]
+
 todo_include_todos = True
 
 # Add any paths that contain templates here, relative to this directory.
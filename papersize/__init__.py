@@ -33,12 +33,17 @@ Constants
 .. autodata:: SIZES
     :annotation:
 
+.. autodata:: CATALOGS
+    :annotation:
+
 .. autodata:: PORTRAIT
     :annotation:
 
 .. autodata:: LANDSCAPE
     :annotation:
 
+.. autodata:: INTERN_MAX
+
 Unit conversion
 ---------------
 
@@ -53,6 +58,28 @@ Parsers
 
 .. autofunction:: parse_papersize
 
+.. autofunction:: as_length
+
+.. autofunction:: as_papersize
+
+.. autofunction:: intern_papersize
+
+ISO series
+----------
+
+.. autofunction:: iter_series
+
+Formatting
+----------
+
+.. autofunction:: format_length
+
+.. autofunction:: format_papersize
+
+.. autofunction:: format_lengths
+
+.. autofunction:: format_papersizes
+
 Paper orientation
 -----------------
 
@@ -76,39 +103,138 @@ Exceptions
 """
 
 from __future__ import unicode_literals
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation
+import collections
 import re
 
 __version__ = "1.0.1"
 __AUTHOR__ = "Louis Paternault (spalax+python@gresille.org)"
 __COPYRIGHT__ = "(C) 2014-2017 Louis Paternault. GNU GPL 3 or later."
 
+# ISO 216 (A and B series) and ISO 269 (C series) sizes are computed:
+# - sizes of index 0 are given by formulas (in millimeters): for instance, A0 has
+#   an area of one square meter, and a ratio of square root of two;
+# - other sizes are obtained by halving the longer side of the previous size
+#   (rounded down to the millimeter), or by doubling the shorter side of the next
+#   size (for 2A0, 4A0, etc.).
+_SERIES_EXPONENTS = {"a": -0.25, "b": 0, "c": -0.125}
+_SERIES_CACHE = {}
+# Sizes are zero millimeter wide long before index 32, and multiples are at most
+# 2**32 (user input is not trusted)
+_SERIES_MAX_INDEX = 32
+
+__SERIES_COMPILED_RE = re.compile(
+    r"^(?:(?P<multiple>[1-9]\d*)(?P<series>[abc])0"
+    r"|(?P<name>[abc])(?P<index>0|[1-9]\d*))$"
+)
+
+
+def _series_name(series, index):
+    """Return the name of a size of an ISO series.
+
+    Negative indexes correspond to multiples of the size of index 0.
+    """
+    if index < 0:
+        return "{}{}0".format(2 ** -index, series)
+    return "{}{}".format(series, index)
+
+
+def _series_size(series, index):
+    """Return the size of an ISO series, as a couple of integers (in millimeters).
+
+    Results are cached.
+    """
+    try:
+        return _SERIES_CACHE[(series, index)]
+    except KeyError:
+        pass
+    if index > _SERIES_MAX_INDEX:
+        return (0, 0)
+    if index == 0:
+        exponent = _SERIES_EXPONENTS[series]
+        size = (
+            int(round(1000 * 2 ** exponent)),
+            int(round(1000 * 2 ** (exponent + 0.5))),
+        )
+    else:
+        # Start from the closest cached size
+        step = 1 if index > 0 else -1
+        current = index - step
+        while (series, current) not in _SERIES_CACHE and current != 0:
+            current -= step
+        size = _series_size(series, current)
+        while current != index:
+            current += step
+            if step > 0:
+                if size[0] == 0:
+                    # Too small: no need to go further
+                    return size
+                size = (size[1] // 2, size[0])
+            else:
+                size = (size[1], 2 * size[0])
+            _SERIES_CACHE[(series, current)] = size
+    _SERIES_CACHE[(series, index)] = size
+    return size
+
+
+def _series_papersize(name):
+    """Return the size of an ISO series, as a string, or ``None``.
+
+    :param str name: Lower case name of the size (e.g. ``a4``, ``4a0``, ``c11``).
+    """
+    match = __SERIES_COMPILED_RE.match(name)
+    if match is None:
+        return None
+    if match.group("multiple") is None:
+        if len(match.group("index")) > 10:
+            return None
+        series, index = match.group("name"), int(match.group("index"))
+    else:
+        if len(match.group("multiple")) > 10:
+            return None
+        multiple = int(match.group("multiple"))
+        if multiple < 2 or multiple & (multiple - 1):
+            # Not a power of two
+            return None
+        if multiple.bit_length() > _SERIES_MAX_INDEX + 1:
+            return None
+        series, index = match.group("series"), 1 - multiple.bit_length()
+    width, height = _series_size(series, index)
+    if width == 0:
+        return None
+    return "{}mm x {}mm".format(width, height)
+
+
+def iter_series(series, first=0, last=None):
+    """Iterate over the sizes of an ISO 216 or ISO 269 series.
+
+    :param str series: One of ``a``, ``b``, ``c``.
+    :param int first: Index of the first size. Negative indexes correspond to
+        multiples of the size of index 0 (``-1`` is ``2a0``, ``-2`` is ``4a0``,
+        etc.).
+    :param int last: Index of the last size (included). If ``None``, iterate
+        until sizes are too small to be expressed in millimeters.
+    :return: An iterator of couples ``(name, size)``, where ``size`` is a
+        string parsable by :func:`parse_papersize`. Sizes are computed as the
+        iterator is consumed.
+
+    >>> for name, size in iter_series("b", -1, 1):
+    ...     print("{}: {}".format(name, size))
+    2b0: 1414mm x 2000mm
+    b0: 1000mm x 1414mm
+    b1: 707mm x 1000mm
+    """
+    index = first
+    while last is None or index <= last:
+        width, height = _series_size(series, index)
+        if width == 0:
+            return
+        yield (_series_name(series, index), "{}mm x {}mm".format(width, height))
+        index += 1
+
+
 SIZES = {
     # http://www.printernational.org/iso-paper-sizes.php
-    "4a0": "1682mm x 2378mm",
-    "2a0": "1189mm x 1682mm",
-    "a0": "841mm x 1189mm",
-    "a1": "594mm x 841mm",
-    "a2": "420mm x 594mm",
-    "a3": "297mm x 420mm",
-    "a4": "210mm x 297mm",
-    "a5": "148mm x 210mm",
-    "a6": "105mm x 148mm",
-    "a7": "74mm x 105mm",
-    "a8": "52mm x 74mm",
-    "a9": "37mm x 52mm",
-    "a10": "26mm x 37mm",
-    "b0": "1000mm x 1414mm",
-    "b1": "707mm x 1000mm",
-    "b2": "500mm x 707mm",
-    "b3": "353mm x 500mm",
-    "b4": "250mm x 352mm",
-    "b5": "176mm x 250mm",
-    "b6": "125mm x 176mm",
-    "b7": "88mm x 125mm",
-    "b8": "62mm x 88mm",
-    "b9": "44mm x 62mm",
-    "b10": "31mm x 44mm",
     "a2extra": "445mm x 619mm",
     "a3extra": "322mm x 445mm",
     "a3super": "305mm x 508mm",
@@ -136,17 +262,6 @@ SIZES = {
     "11x17": "11in x 17in",
     "10x14": "10in x 14in",
     # https://en.wikipedia.org/w/index.php?title=Paper_size&oldid=814180250
-    "c0": "917mm × 1297mm",
-    "c1": "648mm × 917mm",
-    "c2": "458mm × 648mm",
-    "c3": "324mm × 458mm",
-    "c4": "229mm × 324mm",
-    "c5": "162mm × 229mm",
-    "c6": "114mm × 162mm",
-    "c7": "81mm × 114mm",
-    "c8": "57mm × 81mm",
-    "c9": "40mm × 57mm",
-    "c10": "28mm × 40mm",
     "juniorlegal": "5in × 8in",
     "memo": "halfletter",
     "governmentletter": "8in × 10.5in",
@@ -172,6 +287,26 @@ SIZES = {
 Keys are names (e.g. ``a4``, ``letter``) and values are strings,
 human-readable, and parsable by :func:`parse_papersize` (e.g. ``21cm x
 29.7cm``).
+
+Sizes of the ISO series included in this dictionary are ``4a0`` to ``a10``,
+``b0`` to ``b10`` and ``c0`` to ``c10``. Other sizes of those series (e.g.
+``a11`` or ``8a0``) are not, but are still recognized by
+:func:`parse_papersize` (see :func:`iter_series`).
+"""
+
+SIZES.update(iter_series("a", -2, 10))
+SIZES.update(iter_series("b", 0, 10))
+SIZES.update(iter_series("c", 0, 10))
+
+CATALOGS = []
+"""List of additional catalogs of named sizes.
+
+Each catalog is a mapping with the same structure as :data:`SIZES` (lower
+case names as keys, and strings parsable by :func:`parse_papersize` as
+values). Names which are not in :data:`SIZES` are looked up in those
+catalogs (in order) by :func:`parse_papersize`. Values of catalogs may refer
+to names of :data:`SIZES` or of ISO series, but not to names of catalogs.
+See :func:`papersize.catalog.load_catalog`.
 """
 
 # Source: http://en.wikibooks.org/wiki/LaTeX/Lengths
@@ -262,11 +397,17 @@ def convert_length(length, orig, dest):
     :param str dest: Unit in which ``length`` will be converted, as a string
         which is a key of :data:`UNITS`.
 
-    Due to floating point arithmetic, there can be small rounding errors.
+    Due to floating point arithmetic, there can be small rounding errors. If
+    ``orig`` and ``dest`` are the same unit, ``length`` is returned unchanged
+    (as a :class:`decimal.Decimal`).
 
     >>> convert_length(0.1, "cm", "mm")
     Decimal('1.000000000000000055511151231')
+    >>> convert_length("0.1", "cm", "cm")
+    Decimal('0.1')
     """
+    if orig == dest:
+        return Decimal(length)
     return (Decimal(UNITS[orig]) * Decimal(length)) / Decimal(UNITS[dest])
 
 
@@ -292,7 +433,46 @@ def parse_length(string, unit="pt"):
     return convert_length(Decimal(match.groups()[0]), match.groups()[1], unit)
 
 
-def parse_couple(string, unit="pt"):
+INTERN_MAX = 4096
+"""Maximum number of sizes kept by :func:`intern_papersize`.
+
+When this limit is reached, the pool of interned sizes is emptied.
+"""
+
+_INTERNED = {}
+
+
+def intern_papersize(size, unit="pt"):
+    """Return a canonical object equal to a paper size.
+
+    :param tuple size: Couple of dimensions, as :class:`decimal.Decimal`.
+    :param str unit: The unit of ``size``.
+    :return: A :class:`tuple` equal to ``size``. Equal sizes (with the same
+        unit) passed to this function return the very same object (as long
+        as the pool of interned sizes is not emptied; see
+        :data:`INTERN_MAX`).
+
+    This is useful to save memory when many (equal) sizes are kept, and to
+    compare them using identity. Neither tuples nor
+    :class:`decimal.Decimal` objects can be weakly referenced, so interned
+    sizes are kept until the pool is emptied.
+
+    >>> intern_papersize(parse_papersize("a4")) is parse_papersize("A4", intern=True)
+    True
+    """
+    key = (unit,) + tuple(size)
+    try:
+        return _INTERNED[key]
+    except KeyError:
+        pass
+    if len(_INTERNED) >= INTERN_MAX:
+        _INTERNED.clear()
+    size = tuple(size)
+    _INTERNED[key] = size
+    return size
+
+
+def parse_couple(string, unit="pt", intern=False):
     """Return a tuple of dimensions.
 
     :param str string: The string to parse, as "LENGTHxLENGTH" (where LENGTH
@@ -300,6 +480,9 @@ def parse_couple(string, unit="pt"):
         29.7cm``. The separator can be ``x``, ``×`` or empty, surrounded by an
         arbitrary number of spaces. For instance: ``2cmx3cm``, ``2cm x 3cm``,
         ``2cm×3cm``, ``2cm 3cm``.
+    :param str unit: The unit of the return values.
+    :param bool intern: If ``True``, return an interned object (see
+        :func:`intern_papersize`).
     :rtype: :class:`tuple`
     :return: A tuple of :class:`decimal.Decimal`, representing the dimensions.
 
@@ -310,20 +493,26 @@ def parse_couple(string, unit="pt"):
     """
     try:
         match = __PAPERSIZE_COMPILED_RE.match(string).groupdict()
-        return (parse_length(match["width"], unit), parse_length(match["height"], unit))
+        size = (parse_length(match["width"], unit), parse_length(match["height"], unit))
     except AttributeError:
         raise CouldNotParse(string)
+    if intern:
+        return intern_papersize(size, unit)
+    return size
 
 
-def parse_papersize(string, unit="pt"):
+def parse_papersize(string, unit="pt", intern=False):
     """Return the papersize corresponding to string.
 
     :param str string: The string to parse. It can be either a named size (as
-        keys of constant :data:`SIZES`), or a couple of lengths (that will be
-        processed by :func:`parse_couple`). The named paper sizes are case
-        insensitive.  The following strings return the same size: ``a4``,
+        keys of constant :data:`SIZES` or of :data:`CATALOGS`, or a size of
+        an ISO series), or a couple of lengths (that will be processed by
+        :func:`parse_couple`). The named paper sizes are case insensitive.
+        The following strings return the same size: ``a4``,
         ``A4``, ``21cm 29.7cm``, ``210mmx297mm``, ``21cm  ×  297mm``…
     :param str unit: The unit of the return values.
+    :param bool intern: If ``True``, return an interned object (see
+        :func:`intern_papersize`).
     :return: The paper size, as a couple of :class:`decimal.Decimal`.
     :rtype: :class:`tuple`
 
@@ -333,10 +522,240 @@ def parse_papersize(string, unit="pt"):
     (Decimal('2.1E+2'), Decimal('297'))
     >>> parse_papersize("10 100")
     (Decimal('10'), Decimal('100'))
+    >>> parse_papersize("A11", "mm")
+    (Decimal('18'), Decimal('26'))
+    """
+    return _parse_papersize(string, unit, intern, True)
+
+
+def as_length(length, unit="pt"):
+    """Return a length given either as a string or as a number.
+
+    :param length: A string parsable by :func:`parse_length`, or a number
+        (expressed in ``unit``).
+    :param str unit: The unit of the return value.
+    :rtype: :class:`decimal.Decimal`
+
+    >>> as_length("1cm", "cm")
+    Decimal('1')
+    >>> as_length(2.5, "mm")
+    Decimal('2.5')
+    """
+    if isinstance(length, (int, float, Decimal)):
+        return Decimal(length)
+    return parse_length(length, unit)
+
+
+def as_papersize(size, unit="pt"):
+    """Return a paper size given either as a string or as a couple of numbers.
+
+    :param size: A string parsable by :func:`parse_papersize`, or a couple of
+        numbers (expressed in ``unit``).
+    :param str unit: The unit of the return value.
+    :return: The paper size, as a couple of :class:`decimal.Decimal`.
+    :rtype: :class:`tuple`
+
+    >>> as_papersize("A4", "cm")
+    (Decimal('21.0'), Decimal('29.7'))
+    >>> as_papersize([10, 20])
+    (Decimal('10'), Decimal('20'))
+    """
+    if isinstance(size, (tuple, list)):
+        return (Decimal(size[0]), Decimal(size[1]))
+    return parse_papersize(size, unit)
+
+
+def _parse_papersize(string, unit, intern, catalogs):
+    """Return the papersize corresponding to string.
+
+    :param bool catalogs: Whether names are looked up in :data:`CATALOGS`
+        (values of catalogs are parsed without, so that entries of catalogs
+        cannot refer to each other, or to themselves).
+    """
+    name = string.lower()
+    if name in SIZES:
+        return _parse_papersize(SIZES[name], unit, intern, catalogs)
+    if __PAPERSIZE_COMPILED_RE.match(string) is not None:
+        # Not a name: do not look it up in catalogs
+        return parse_couple(string, unit, intern)
+    if catalogs:
+        for catalog in CATALOGS:
+            if name in catalog:
+                return _parse_papersize(catalog[name], unit, intern, False)
+    size = _series_papersize(name)
+    if size is not None:
+        return parse_couple(size, unit, intern)
+    return parse_couple(string, unit, intern)
+
+
+def _round(length, precision):
+    """Convert a length to a non-negative finite decimal, rounded to ``precision``.
+
+    Raise :class:`ValueError` if this is not possible.
+    """
+    length = Decimal(length)
+    if not length.is_finite() or length < 0:
+        raise ValueError("Length '{}' cannot be formatted.".format(length))
+    # Turn -0 into 0
+    length = length.copy_abs()
+    if precision is not None:
+        try:
+            length = length.quantize(Decimal(1).scaleb(-precision))
+        except InvalidOperation:
+            raise ValueError(
+                "Length '{}' cannot be rounded to {} digits.".format(length, precision)
+            )
+    return length
+
+
+def _check_unit(unit):
+    """Raise :class:`ValueError` if ``unit`` is not a key of :data:`UNITS`."""
+    if unit not in UNITS:
+        raise ValueError("Unknown unit '{}'.".format(unit))
+
+
+def format_length(length, unit="pt", precision=None):
+    """Return a string representing a length.
+
+    :param decimal.Decimal length: Length to format, expressed in ``unit``, as
+        any object convertible to a :class:`decimal.Decimal`.
+    :param str unit: The unit of ``length``, as a key of :data:`UNITS`. It is
+        appended to the returned string.
+    :param int precision: If not ``None``, number of digits kept after the
+        decimal point (``length`` is rounded accordingly).
+    :rtype: :class:`str`
+
+    The result never uses scientific notation, and is parsable by
+    :func:`parse_length`: ``parse_length(format_length(length, unit), unit)``
+    is equal to ``length`` (rounded to ``precision``, if given). A
+    :class:`ValueError` is raised for lengths which cannot be represented this
+    way (negative, infinite or *not a number*, or too large to be rounded to
+    ``precision``), and for unknown units.
+
+    >>> print(format_length(parse_length("1cm", "mm"), "mm"))
+    10mm
+    >>> print(format_length(Decimal("29.70"), "cm"))
+    29.7cm
+    >>> print(format_length(parse_length("10cm"), "pt", 2))
+    284.53pt
+    """
+    _check_unit(unit)
+    length = _round(length, precision)
+    text = format(length, "f")
+    if "." in text:
+        text = text.rstrip("0").rstrip(".")
+    return text + unit
+
+
+# Maximum number of distinct items remembered by format_lengths() and
+# format_papersizes()
+_FORMAT_CACHE_SIZE = 4096
+
+
+def _format_many(function, items, *args):
+    """Iterate over ``function(item, *args)`` for items of ``items``.
+
+    The results of the last :data:`_FORMAT_CACHE_SIZE` distinct (hashable)
+    items are cached.
+    """
+    cache = collections.OrderedDict()
+    for item in items:
+        try:
+            text = cache.pop(item)
+        except KeyError:
+            text = function(item, *args)
+        except TypeError:
+            # Not hashable (e.g. lists, or signaling NaN)
+            yield function(item, *args)
+            continue
+        cache[item] = text
+        if len(cache) > _FORMAT_CACHE_SIZE:
+            cache.popitem(last=False)
+        yield text
+
+
+def format_lengths(lengths, unit="pt", precision=None):
+    """Iterate over strings representing lengths.
+
+    This is equivalent to calling :func:`format_length` on each item of
+    ``lengths``, but lengths that appear several times are only formatted
+    once (as long as they are among the last :data:`_FORMAT_CACHE_SIZE`
+    distinct lengths).
+
+    >>> print(", ".join(format_lengths(["1", "2.50", "1"], "cm")))
+    1cm, 2.5cm, 1cm
+    """
+    return _format_many(format_length, lengths, unit, precision)
+
+
+_SIZES_REVERSE = {}
+
+
+def _sizes_reverse(unit):
+    """Return a dictionary mapping sizes (in ``unit``) to names of :data:`SIZES`.
+
+    When several names share the same size, the first one (in alphabetical
+    order) is kept. The result is cached, and rebuilt if the content of
+    :data:`SIZES` has changed since.
+    """
+    try:
+        sizes, reverse = _SIZES_REVERSE[unit]
+        if sizes == SIZES:
+            return reverse
+    except KeyError:
+        pass
+    reverse = {}
+    for name in sorted(SIZES):
+        reverse.setdefault(parse_papersize(name, unit), name)
+    _SIZES_REVERSE[unit] = (dict(SIZES), reverse)
+    return reverse
+
+
+def format_papersize(size, unit="pt", name_if_known=True, precision=None):
+    """Return a string representing a paper size.
+
+    :param tuple size: Couple of dimensions, expressed in ``unit``, as any
+        objects convertible to :class:`decimal.Decimal`.
+    :param str unit: The unit of ``size``, as a key of :data:`UNITS`.
+    :param bool name_if_known: If ``True``, and if ``size`` is exactly a size of
+        :data:`SIZES` (in the same orientation), return its name instead.
+    :param int precision: Passed to :func:`format_length`.
+    :rtype: :class:`str`
+
+    The result is parsable by :func:`parse_papersize`, and
+    ``parse_papersize(format_papersize(size, unit), unit)`` is equal to
+    ``size`` (rounded to ``precision``, if given).
+
+    >>> print(format_papersize(parse_papersize("21cm x 29.7cm", "mm"), "mm"))
+    a4
+    >>> print(format_papersize((297, 210), "mm"))
+    297mm x 210mm
+    >>> print(format_papersize(parse_papersize("a4", "cm"), "cm", name_if_known=False))
+    21cm x 29.7cm
+    """
+    _check_unit(unit)
+    size = tuple(_round(length, precision) for length in size)
+    if name_if_known:
+        try:
+            return _sizes_reverse(unit)[size]
+        except KeyError:
+            pass
+    return "{} x {}".format(
+        format_length(size[0], unit, precision), format_length(size[1], unit, precision)
+    )
+
+
+def format_papersizes(sizes, unit="pt", name_if_known=True, precision=None):
+    """Iterate over strings representing paper sizes.
+
+    This is equivalent to calling :func:`format_papersize` on each item of
+    ``sizes``, but sizes that appear several times are only formatted once
+    (see :func:`format_lengths`).
+
+    >>> print(", ".join(format_papersizes([(595, 842), (612, 792), (595, 842)], "bp")))
+    595bp x 842bp, letter, 595bp x 842bp
     """
-    if string.lower() in SIZES:
-        return parse_papersize(SIZES[string.lower()], unit)
-    return parse_couple(string, unit)
+    return _format_many(format_papersize, sizes, unit, name_if_known, precision)
 
 
 def is_portrait(width, height):
@@ -0,0 +1,156 @@
+#!/usr/bin python
+# -*- coding: utf8 -*-
+
+# Copyright Louis Paternault 2017
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Parse paper sizes in :mod:`asyncio` pipelines.
+
+This module requires Python 3.7 or later (importing it with Python 3.6
+raises :class:`ImportError`; older versions cannot even compile it).
+
+Strings read from an asynchronous iterable are gathered into batches, which
+are parsed either in the event loop (control is given back to the loop
+between batches), or in an executor. Items are only read from the source when
+the consumer asks for them, so that at most one batch is pending at any time.
+
+>>> import asyncio
+>>> async def source():
+...     for string in ["a4", "A5", "1cm 2cm"]:
+...         yield string
+>>> async def main():
+...     return [size async for size in aparse_stream(source(), "cm", batch_size=2)]
+>>> sizes = asyncio.run(main())
+>>> len(sizes), sizes[0]
+(3, (Decimal('21.0'), Decimal('29.7')))
+
+.. autofunction:: aparse_batches
+
+.. autofunction:: aparse_stream
+"""
+
+import asyncio
+import functools
+import sys
+
+import papersize
+
+if sys.version_info < (3, 7):
+    raise ImportError("Module 'papersize.aio' requires Python 3.7 or later.")
+
+# Maximum number of parsed strings kept from one batch to the next
+_CACHE_SIZE = 4096
+
+
+def _parse_batch(batch, unit):
+    """Parse a list of strings, parsing each distinct string only once."""
+    cache = {}
+    sizes = []
+    for string in batch:
+        if string not in cache:
+            cache[string] = papersize.parse_papersize(string, unit)
+        sizes.append(cache[string])
+    return sizes
+
+
+async def _batches(iterable, batch_size, timeout):
+    """Gather items of an asynchronous iterable into lists.
+
+    If ``timeout`` is not ``None``, a non-empty batch is returned as soon as no
+    item has been read for ``timeout`` seconds.
+    """
+    if timeout is None:
+        batch = []
+        async for item in iterable:
+            batch.append(item)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+        return
+
+    iterator = iterable.__aiter__()
+    pending = None
+    exhausted = False
+    try:
+        while not exhausted:
+            batch = []
+            while len(batch) < batch_size:
+                if pending is None:
+                    pending = asyncio.ensure_future(iterator.__anext__())
+                done, __ = await asyncio.wait(
+                    [pending], timeout=(timeout if batch else None)
+                )
+                if not done:
+                    break
+                try:
+                    batch.append(pending.result())
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                finally:
+                    pending = None
+            if batch:
+                yield batch
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+async def aparse_batches(
+    iterable, unit="pt", batch_size=1000, executor=None, timeout=None
+):
+    """Parse strings of an asynchronous iterable, by batches.
+
+    :param iterable: Asynchronous iterable of strings, parsable by
+        :func:`papersize.parse_papersize`.
+    :param str unit: The unit of the sizes.
+    :param int batch_size: Maximum number of strings in a batch.
+    :param executor: If ``None``, batches are parsed in the event loop
+        (recently parsed strings are cached from one batch to the next).
+        Otherwise, an :class:`concurrent.futures.Executor` (or ``"default"``,
+        for the default executor of the loop) in which batches are parsed
+        (distinct strings of a batch are parsed only once).
+    :param float timeout: If not ``None``, an incomplete batch is parsed as soon
+        as no string has been read for ``timeout`` seconds (useful when the
+        source is slow, e.g. a message queue).
+    :return: An asynchronous iterator of lists of sizes.
+    """
+    loop = asyncio.get_running_loop()
+    parse = functools.lru_cache(maxsize=_CACHE_SIZE)(
+        functools.partial(papersize.parse_papersize, unit=unit)
+    )
+    async for batch in _batches(iterable, batch_size, timeout):
+        if executor is None:
+            sizes = [parse(string) for string in batch]
+            # Let other coroutines run
+            await asyncio.sleep(0)
+        else:
+            sizes = await loop.run_in_executor(
+                None if executor == "default" else executor, _parse_batch, batch, unit
+            )
+        yield sizes
+
+
+async def aparse_stream(iterable, unit="pt", **kwargs):
+    """Parse strings of an asynchronous iterable.
+
+    This is the same as :func:`aparse_batches`, but sizes are yielded one by
+    one (arguments are the same).
+    """
+    async for sizes in aparse_batches(iterable, unit, **kwargs):
+        for size in sizes:
+            yield size
@@ -0,0 +1,112 @@
+#!/usr/bin python
+# -*- coding: utf8 -*-
+
+# Copyright Louis Paternault 2017
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Parse paper sizes stored in :mod:`pyarrow` arrays.
+
+This module requires `pyarrow <https://arrow.apache.org>`_ and `numpy
+<https://numpy.org>`_ (install ``papersize[arrow]``).
+
+Arrays are dictionary-encoded first (unless they already are), so that each
+distinct value is parsed only once, whatever the length of the array.
+
+.. autofunction:: parse
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import numpy
+import pyarrow
+import pyarrow.compute
+
+import papersize
+
+
+def _parse_dictionary(chunk, unit, errors, cache):
+    """Parse the dictionary of a dictionary array, and return widths and heights.
+
+    :param dict cache: Values already parsed (in previous chunks), mapped to
+        their ``(width, height)`` couple as floats.
+
+    Only the dictionary items which are referenced by the array are parsed
+    (others are ``NaN``). An extra ``NaN`` item is appended to both arrays, so
+    that null values are mapped to ``NaN``.
+    """
+    dictionary = chunk.dictionary
+    widths = numpy.full(len(dictionary) + 1, numpy.nan)
+    heights = numpy.full(len(dictionary) + 1, numpy.nan)
+    used = pyarrow.compute.unique(chunk.indices.drop_null())
+    for index, value in zip(
+        used.to_pylist(), dictionary.take(used.cast(pyarrow.int64())).to_pylist()
+    ):
+        if value not in cache:
+            try:
+                cache[value] = papersize.parse_papersize(value, unit)
+            except papersize.CouldNotParse:
+                if errors == "raise":
+                    raise
+                cache[value] = (numpy.nan, numpy.nan)
+        widths[index], heights[index] = cache[value]
+    return widths, heights
+
+
+def parse(array, unit="pt", errors="raise"):
+    """Parse an array of paper sizes.
+
+    :param array: Array of strings (or dictionary array of strings), parsable
+        by :func:`papersize.parse_papersize`. Nulls are allowed.
+    :type array: :class:`pyarrow.Array` or :class:`pyarrow.ChunkedArray`
+    :param str unit: The unit of the return values.
+    :param str errors: If ``"raise"``, invalid values raise
+        :class:`papersize.CouldNotParse`; if ``"coerce"``, they are set as
+        null.
+    :return: A table with two ``float64`` columns ``width`` and ``height``,
+        chunked as ``array``. Nulls (and coerced errors) are null.
+    :rtype: :class:`pyarrow.Table`
+
+    >>> parse(pyarrow.array(["a4", None, "1cm x 2cm"]), "cm").to_pydict()
+    {'width': [21.0, None, 1.0], 'height': [29.7, None, 2.0]}
+    """
+    if errors not in ("raise", "coerce"):
+        raise ValueError("Argument 'errors' must be one of 'raise' or 'coerce'.")
+    if isinstance(array, pyarrow.ChunkedArray):
+        chunks = array.chunks
+    else:
+        chunks = [array]
+
+    cache = {}
+    width_chunks = []
+    height_chunks = []
+    for chunk in chunks:
+        if not pyarrow.types.is_dictionary(chunk.type):
+            chunk = chunk.dictionary_encode()
+        widths, heights = _parse_dictionary(chunk, unit, errors, cache)
+        indices = (
+            chunk.indices.fill_null(len(chunk.dictionary))
+            .to_numpy(zero_copy_only=False)
+            .astype(numpy.intp)
+        )
+        width_chunks.append(pyarrow.array(widths[indices], from_pandas=True))
+        height_chunks.append(pyarrow.array(heights[indices], from_pandas=True))
+
+    return pyarrow.table(
+        [
+            pyarrow.chunked_array(width_chunks, type=pyarrow.float64()),
+            pyarrow.chunked_array(height_chunks, type=pyarrow.float64()),
+        ],
+        names=["width", "height"],
+    )
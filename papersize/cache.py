@@ -0,0 +1,190 @@
+#!/usr/bin python
+# -*- coding: utf8 -*-
+
+# Copyright Louis Paternault 2017
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Persistent cache of parsed sizes.
+
+A :class:`PersistentCache` stores results of :func:`papersize.parse_couple`
+and :func:`papersize.parse_papersize` in a `sqlite <https://sqlite.org>`_
+database, which can be shared by several processes (or successive runs of the
+same program). Every result found in the database is loaded in memory when
+the cache is opened, so that processes start with a warm cache.
+
+Results are stored with a version string (see :func:`registry_version`),
+which depends on the version of this library, and on the content of
+:data:`papersize.SIZES`, :data:`papersize.UNITS` and
+:data:`papersize.CATALOGS`: results stored by a different version are
+ignored.
+
+>>> import os, tempfile
+>>> filename = os.path.join(tempfile.mkdtemp(), "cache.sqlite")
+>>> with PersistentCache(filename) as cache:
+...     cache.parse_papersize("A4", "mm")
+(Decimal('210'), Decimal('297'))
+>>> with PersistentCache(filename) as cache:
+...     len(cache)
+1
+
+.. autoclass:: PersistentCache
+    :members:
+
+.. autofunction:: registry_version
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+from decimal import Decimal
+import hashlib
+import os
+import sqlite3
+
+import papersize
+
+_FUNCTIONS = {
+    "parse_couple": papersize.parse_couple,
+    "parse_papersize": papersize.parse_papersize,
+}
+
+
+def registry_version():
+    """Return a string identifying the parsing rules currently in use.
+
+    It changes when the version of this library changes, or when
+    :data:`papersize.SIZES`, :data:`papersize.UNITS` or
+    :data:`papersize.CATALOGS` are modified (catalogs loaded from files are
+    identified by their file name, modification time and size).
+    """
+    digest = hashlib.sha1()
+    for registry in (papersize.SIZES, papersize.UNITS):
+        for key, value in sorted(registry.items()):
+            digest.update("{}={};".format(key, value).encode("utf8"))
+    for catalog in papersize.CATALOGS:
+        if hasattr(catalog, "version"):
+            digest.update("catalog={};".format(catalog.version).encode("utf8"))
+        else:
+            for key, value in sorted(catalog.items()):
+                digest.update("{}={};".format(key, value).encode("utf8"))
+    return "{}:{}".format(papersize.__version__, digest.hexdigest())
+
+
+class PersistentCache(object):
+    """Cache of parsed sizes, stored in a sqlite database.
+
+    :param str filename: Name of the database (created if necessary).
+    :param float timeout: Number of seconds to wait for a lock held by
+        another process, before giving up.
+
+    The database is opened in `write-ahead logging
+    <https://sqlite.org/wal.html>`_ mode, so that concurrent processes can
+    read it while another one writes. A cache object can be created before
+    forking: each process opens its own connection to the database.
+
+    The version (see :func:`registry_version`) is computed when the cache is
+    loaded: if :data:`papersize.SIZES`, :data:`papersize.UNITS` or
+    :data:`papersize.CATALOGS` are modified after that, :meth:`load` should be
+    called again.
+    """
+
+    def __init__(self, filename, timeout=30):
+        self.filename = filename
+        self.timeout = timeout
+        self.version = None
+        self._memory = {}
+        self._connection = None
+        self._pid = None
+        self.load()
+
+    def __len__(self):
+        return len(self._memory)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def connection(self):
+        """Connection to the database, opened in the current process."""
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = sqlite3.connect(
+                self.filename, timeout=self.timeout, isolation_level=None
+            )
+            self._pid = os.getpid()
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS sizes (
+                    version TEXT NOT NULL,
+                    function TEXT NOT NULL,
+                    string TEXT NOT NULL,
+                    unit TEXT NOT NULL,
+                    width TEXT NOT NULL,
+                    height TEXT NOT NULL,
+                    PRIMARY KEY (version, function, string, unit)
+                )
+                """)
+        return self._connection
+
+    def load(self):
+        """Load (in memory) every result of the current version."""
+        self.version = registry_version()
+        self._memory = dict(
+            ((function, string, unit), (Decimal(width), Decimal(height)))
+            for (function, string, unit, width, height) in self.connection.execute(
+                "SELECT function, string, unit, width, height "
+                "FROM sizes WHERE version = ?",
+                (self.version,),
+            )
+        )
+
+    def prune(self):
+        """Delete results of other versions from the database."""
+        self.connection.execute("DELETE FROM sizes WHERE version != ?", (self.version,))
+
+    def close(self):
+        """Close the connection to the database (the cache is still usable)."""
+        if self._connection is not None and self._pid == os.getpid():
+            self._connection.close()
+        self._connection = None
+
+    def _parse(self, function, string, unit):
+        """Return the result of ``function(string, unit)``, using the cache."""
+        key = (function, string, unit)
+        try:
+            return self._memory[key]
+        except KeyError:
+            pass
+        size = _FUNCTIONS[function](string, unit)
+        self.connection.execute(
+            "INSERT OR IGNORE INTO sizes VALUES (?, ?, ?, ?, ?, ?)",
+            (self.version, function, string, unit, str(size[0]), str(size[1])),
+        )
+        self._memory[key] = size
+        return size
+
+    def parse_couple(self, string, unit="pt"):
+        """Cached version of :func:`papersize.parse_couple`."""
+        return self._parse("parse_couple", string, unit)
+
+    def parse_papersize(self, string, unit="pt"):
+        """Cached version of :func:`papersize.parse_papersize`.
+
+        Named sizes are case insensitive, so they are cached in lower case.
+        """
+        if string.lower() in papersize.SIZES:
+            string = string.lower()
+        return self._parse("parse_papersize", string, unit)
@@ -0,0 +1,290 @@
+#!/usr/bin python
+# -*- coding: utf8 -*-
+
+# Copyright Louis Paternault 2017
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""External catalogs of named sizes.
+
+A catalog maps names to sizes, like :data:`papersize.SIZES`. Once loaded (and
+registered in :data:`papersize.CATALOGS`), its names are recognized by
+:func:`papersize.parse_papersize`. Values are only read (and parsed) when a
+name is used, so that loading large catalogs is cheap.
+
+Supported formats (guessed from the file extension) are:
+
+- ``json``: an object mapping names to sizes;
+- ``toml``: a table mapping names to sizes (requires Python 3.11, or
+  `tomli <https://pypi.org/project/tomli>`_);
+- ``csv``: one ``name,size`` line per size (without quoting; empty lines
+  and lines starting with ``#`` are ignored);
+- ``catalog``: a precompiled catalog (see :func:`compile_catalog`), which is
+  memory-mapped: nothing but its header is read at load time, and names are
+  looked up by binary search.
+
+Names are case insensitive.
+
+.. autofunction:: load_catalog
+
+.. autofunction:: compile_catalog
+
+.. autoclass:: Catalog
+    :members:
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import json
+import mmap
+import os
+import struct
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+import papersize
+
+FORMATS = ("json", "toml", "csv", "catalog")
+
+_MAGIC = b"PSCATLG1"
+_HEADER = struct.Struct("=8sQ")
+_OFFSET = struct.Struct("=Q")
+
+
+class Catalog(Mapping):
+    """Base class of catalogs: a read-only mapping of names to sizes.
+
+    :param str filename: Name of the file the catalog has been read from.
+    """
+
+    def __init__(self, filename):
+        super(Catalog, self).__init__()
+        self.filename = filename
+        stat = os.stat(filename)
+        self.version = "{}:{}:{}".format(
+            os.path.abspath(filename), stat.st_mtime, stat.st_size
+        )
+
+    def close(self):
+        """Release resources (if any) used by the catalog."""
+
+
+class _DictCatalog(Catalog):
+    """Catalog backed by a dictionary."""
+
+    def __init__(self, filename, sizes):
+        super(_DictCatalog, self).__init__(filename)
+        self._sizes = dict((name.lower(), value) for name, value in sizes.items())
+
+    def __getitem__(self, name):
+        return self._sizes[name]
+
+    def __contains__(self, name):
+        return name in self._sizes
+
+    def __iter__(self):
+        return iter(self._sizes)
+
+    def __len__(self):
+        return len(self._sizes)
+
+
+class _CSVCatalog(Catalog):
+    """Catalog of a CSV file: only names are read at load time.
+
+    The file is memory-mapped, and the offsets of values are stored; values
+    are read (and cached) the first time they are needed.
+    """
+
+    def __init__(self, filename):
+        super(_CSVCatalog, self).__init__(filename)
+        self._offsets = {}
+        self._values = {}
+        self._data = None
+        with open(filename, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        start = 0
+        while start < len(self._data):
+            end = self._data.find(b"\n", start)
+            if end == -1:
+                end = len(self._data)
+            comma = self._data.find(b",", start, end)
+            if comma != -1 and not self._data[start : start + 1] == b"#":
+                name = self._data[start:comma].decode("utf8").strip().lower()
+                self._offsets.setdefault(name, (comma + 1, end))
+            start = end + 1
+
+    def __getitem__(self, name):
+        try:
+            return self._values[name]
+        except KeyError:
+            start, end = self._offsets[name]
+        self._values[name] = self._data[start:end].decode("utf8").strip()
+        return self._values[name]
+
+    def __contains__(self, name):
+        return name in self._offsets
+
+    def __iter__(self):
+        return iter(self._offsets)
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def close(self):
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+
+
+class _CompiledCatalog(Catalog):
+    """Precompiled catalog: the file is memory-mapped, and nothing is read at
+    load time but its header.
+
+    File format: a header (magic string, and number of sizes), a table of
+    offsets (one per size, sorted by name), and records ``name\\0size\\0``.
+    """
+
+    def __init__(self, filename):
+        super(_CompiledCatalog, self).__init__(filename)
+        with open(filename, "rb") as file:
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._data) >= _HEADER.size:
+            magic, self._length = _HEADER.unpack_from(self._data, 0)
+        else:
+            magic = None
+        if magic != _MAGIC:
+            self._data.close()
+            raise ValueError("File '{}' is not a compiled catalog.".format(filename))
+        self._values = {}
+
+    def _record(self, index):
+        """Return the ``(name, size)`` couple of given index, as bytes."""
+        offset = _OFFSET.unpack_from(self._data, _HEADER.size + _OFFSET.size * index)[0]
+        middle = self._data.find(b"\0", offset)
+        end = self._data.find(b"\0", middle + 1)
+        return self._data[offset:middle], self._data[middle + 1 : end]
+
+    def _find(self, name):
+        """Return the index of a name (by binary search), or ``None``."""
+        key = name.encode("utf8")
+        low, high = 0, self._length
+        while low < high:
+            middle = (low + high) // 2
+            if self._record(middle)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._length and self._record(low)[0] == key:
+            return low
+        return None
+
+    def __getitem__(self, name):
+        try:
+            return self._values[name]
+        except KeyError:
+            pass
+        index = self._find(name)
+        if index is None:
+            raise KeyError(name)
+        self._values[name] = self._record(index)[1].decode("utf8")
+        return self._values[name]
+
+    def __contains__(self, name):
+        return name in self._values or self._find(name) is not None
+
+    def __iter__(self):
+        for index in range(self._length):
+            yield self._record(index)[0].decode("utf8")
+
+    def __len__(self):
+        return self._length
+
+    def close(self):
+        self._data.close()
+
+
+def _read_json(filename):
+    """Return the dictionary of sizes of a JSON file."""
+    with open(filename, "rb") as file:
+        return json.loads(file.read().decode("utf8"))
+
+
+def _read_toml(filename):
+    """Return the dictionary of sizes of a TOML file."""
+    try:
+        import tomllib  # pylint: disable = import-outside-toplevel
+    except ImportError:
+        import tomli as tomllib  # pylint: disable = import-outside-toplevel
+    with open(filename, "rb") as file:
+        return tomllib.load(file)
+
+
+def load_catalog(filename, format=None, register=True):
+    """Load a catalog of named sizes.
+
+    :param str filename: Name of the catalog file.
+    :param str format: Format of the file (one of ``json``, ``toml``, ``csv``,
+        ``catalog``). If ``None``, it is guessed from the file extension.
+    :param bool register: If ``True``, the catalog is appended to
+        :data:`papersize.CATALOGS`, so that its names are recognized by
+        :func:`papersize.parse_papersize`.
+    :rtype: :class:`Catalog`
+    """
+    # pylint: disable = redefined-builtin
+    if format is None:
+        format = os.path.splitext(filename)[1].lstrip(".").lower()
+    if format == "json":
+        catalog = _DictCatalog(filename, _read_json(filename))
+    elif format == "toml":
+        catalog = _DictCatalog(filename, _read_toml(filename))
+    elif format == "csv":
+        catalog = _CSVCatalog(filename)
+    elif format == "catalog":
+        catalog = _CompiledCatalog(filename)
+    else:
+        raise ValueError(
+            "Unknown catalog format '{}' (must be one of {}).".format(
+                format, ", ".join(FORMATS)
+            )
+        )
+    if register:
+        papersize.CATALOGS.append(catalog)
+    return catalog
+
+
+def compile_catalog(sizes, filename):
+    """Write a precompiled catalog, which can be loaded by :func:`load_catalog`.
+
+    :param sizes: Mapping of names to sizes (e.g. a :class:`Catalog` loaded
+        from a file in another format).
+    :param str filename: Name of the file to write.
+    """
+    records = sorted(
+        (name.lower().encode("utf8"), value.encode("utf8"))
+        for name, value in sizes.items()
+    )
+    offset = _HEADER.size + _OFFSET.size * len(records)
+    with open(filename, "wb") as file:
+        file.write(_HEADER.pack(_MAGIC, len(records)))
+        for name, value in records:
+            file.write(_OFFSET.pack(offset))
+            offset += len(name) + len(value) + 2
+        for name, value in records:
+            file.write(name + b"\0" + value + b"\0")
@@ -0,0 +1,134 @@
+#!/usr/bin python
+# -*- coding: utf8 -*-
+
+# Copyright Louis Paternault 2017
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Group measured sizes into distinct formats.
+
+Measured sizes (e.g. read from scanners or PDF files) are noisy: the same
+physical format may be reported as 595.27, 595.28 or 595.3. This module groups
+such sizes, whatever their orientation, in a single pass: sizes are hashed
+into a grid of cells of the size of the tolerance, so that each size is only
+compared to clusters of neighbouring cells.
+
+A cluster is defined by its first size (its *seed*): a size belongs to the
+first cluster whose seed is within the tolerance (on both dimensions), or
+starts a new cluster.
+
+>>> clusters = cluster([(595, 842), (842, 596), (612, 792)], 1)
+>>> [tuple(item) for item in clusters]
+[(595.5, 842.0, 2), (612.0, 792.0, 1)]
+
+.. autoclass:: Cluster
+
+.. autoclass:: Clusterer
+    :members:
+
+.. autofunction:: cluster
+"""
+
+from __future__ import absolute_import, division, unicode_literals
+
+import collections
+import math
+
+import papersize
+
+
+class Cluster(collections.namedtuple("Cluster", ["width", "height", "count"])):
+    """A group of similar sizes.
+
+    :param float width: Mean width of the sizes of the cluster (in portrait).
+    :param float height: Mean height of the sizes of the cluster (in portrait).
+    :param int count: Number of sizes in the cluster.
+    """
+
+    __slots__ = ()
+
+
+class Clusterer(object):
+    """Group sizes, one at a time.
+
+    :param tolerance: Maximum difference (on each dimension) between a size
+        and the seed of a cluster, for the size to belong to the cluster, as
+        a number (expressed in the unit of the sizes).
+    """
+
+    def __init__(self, tolerance):
+        self.tolerance = float(tolerance)
+        if self.tolerance <= 0:
+            raise ValueError("Argument 'tolerance' must be positive.")
+        # Lists of [seed width, seed height, sum of widths, sum of heights,
+        # count], indexed by the cell of their seed.
+        self._cells = collections.defaultdict(list)
+        self._clusters = []
+
+    def _cell(self, width, height):
+        """Return the cell of a size."""
+        return (
+            int(math.floor(width / self.tolerance)),
+            int(math.floor(height / self.tolerance)),
+        )
+
+    def add(self, size, count=1):
+        """Add a size (or ``count`` times the same size)."""
+        width, height = papersize.rotate(
+            (float(size[0]), float(size[1])), papersize.PORTRAIT
+        )
+        column, row = self._cell(width, height)
+        for cell in ((column + i, row + j) for i in (-1, 0, 1) for j in (-1, 0, 1)):
+            for item in self._cells.get(cell, ()):
+                if (
+                    abs(item[0] - width) <= self.tolerance
+                    and abs(item[1] - height) <= self.tolerance
+                ):
+                    item[2] += count * width
+                    item[3] += count * height
+                    item[4] += count
+                    return
+        item = [width, height, count * width, count * height, count]
+        self._cells[(column, row)].append(item)
+        self._clusters.append(item)
+
+    def update(self, sizes):
+        """Add several sizes."""
+        for size in sizes:
+            self.add(size)
+
+    def clusters(self):
+        """Return the list of :class:`Cluster`, most frequent first."""
+        return sorted(
+            (
+                Cluster(item[2] / item[4], item[3] / item[4], item[4])
+                for item in self._clusters
+            ),
+            key=lambda item: -item.count,
+        )
+
+
+def cluster(sizes, tolerance):
+    """Group sizes into clusters.
+
+    :param sizes: Iterable of sizes (couples of numbers), in any orientation.
+    :param tolerance: See :class:`Clusterer`.
+    :return: The list of :class:`Cluster`, most frequent first.
+
+    Sizes are processed in a single pass (memory usage only depends on the
+    number of clusters).
+    """
+    clusterer = Clusterer(tolerance)
+    clusterer.update(sizes)
+    return clusterer.clusters()
@@ -0,0 +1,140 @@
+#!/usr/bin python
+# -*- coding: utf8 -*-
+
+# Copyright Louis Paternault 2017
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Fit pages onto paper.
+
+Compute how pages of a document are to be scaled, rotated and placed to fit
+onto a given paper.
+
+>>> placement = fit_page("a5", "a4")
+>>> placement.scale, placement.rotated
+(Decimal('1.414285714285714285714285714'), False)
+>>> [item.rotated for item in fit_pages(["a4", "297mm x 210mm"], "a4")]
+[False, True]
+
+.. autoclass:: Placement
+
+.. autofunction:: fit_page
+
+.. autofunction:: fit_pages
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+from decimal import Decimal
+import collections
+
+import papersize
+
+
+class Placement(collections.namedtuple("Placement", ["scale", "rotated", "x", "y"])):
+    """Placement of a page onto paper.
+
+    :param decimal.Decimal scale: Scale factor applied to the page.
+    :param bool rotated: Whether the page is rotated (by 90°).
+    :param decimal.Decimal x: Horizontal offset of the (scaled and rotated)
+        page, from the left of the paper.
+    :param decimal.Decimal y: Vertical offset of the (scaled and rotated)
+        page, from the bottom of the paper.
+    """
+
+    __slots__ = ()
+
+
+def _fit(page, paper, margin, upscale):
+    """Compute the placement of a page (sizes are couples of decimals)."""
+    width = paper[0] - 2 * margin
+    height = paper[1] - 2 * margin
+    if width <= 0 or height <= 0:
+        raise ValueError("Margins are larger than the paper.")
+    if page[0] <= 0 or page[1] <= 0:
+        raise ValueError("Page dimensions must be positive.")
+
+    # Compare the page, and the page rotated in the orientation of the paper
+    candidates = [(page, False)]
+    turned = papersize.rotate(page, papersize.is_portrait(*paper))
+    if turned != page:
+        candidates.append((turned, True))
+    scale, rotated, (page_width, page_height) = max(
+        (
+            (min(width / size[0], height / size[1]), rotated, size)
+            for size, rotated in candidates
+        ),
+        # On equality, do not rotate
+        key=lambda item: (item[0], not item[1]),
+    )
+    if not upscale:
+        scale = min(scale, Decimal(1))
+    return Placement(
+        scale,
+        rotated,
+        margin + (width - scale * page_width) / 2,
+        margin + (height - scale * page_height) / 2,
+    )
+
+
+def fit_page(page, paper, margin=0, upscale=True, unit="pt"):
+    """Compute the placement of a page onto a paper.
+
+    :param page: Size of the page, as a string parsable by
+        :func:`papersize.parse_papersize`, or as a couple of numbers.
+    :param paper: Size of the paper (same format as ``page``).
+    :param margin: Minimum margin (on every side of the paper), as a string
+        parsable by :func:`papersize.parse_length`, or as a number.
+    :param bool upscale: If ``False``, pages smaller than the paper are not
+        scaled up (their scale is at most 1).
+    :param str unit: The unit of numbers given as arguments, and of the
+        offsets of the result.
+    :rtype: :class:`Placement`
+
+    The page is centered on the paper, and rotated (by 90°) if this gives a
+    larger scale (that is, if orientations of the page and paper differ). A
+    :class:`ValueError` is raised if margins are larger than the paper, or if
+    a dimension of the page is not positive.
+    """
+    return _fit(
+        papersize.as_papersize(page, unit),
+        papersize.as_papersize(paper, unit),
+        papersize.as_length(margin, unit),
+        upscale,
+    )
+
+
+def fit_pages(pages, paper, margin=0, upscale=True, unit="pt"):
+    """Compute the placements of several pages onto a paper.
+
+    :param pages: Iterable of page sizes (see :func:`fit_page`).
+    :return: The list of :class:`Placement` of the pages.
+
+    Other arguments are the same as :func:`fit_page`. Placements of pages
+    having the same size are only computed once.
+    """
+    paper = papersize.as_papersize(paper, unit)
+    margin = papersize.as_length(margin, unit)
+    sizes = {}
+    placements = {}
+    result = []
+    for page in pages:
+        key = tuple(page) if isinstance(page, list) else page
+        if key not in sizes:
+            sizes[key] = papersize.as_papersize(page, unit)
+        size = sizes[key]
+        if size not in placements:
+            placements[size] = _fit(size, paper, margin, upscale)
+        result.append(placements[size])
+    return result
@@ -0,0 +1,252 @@
+#!/usr/bin python
+# -*- coding: utf8 -*-
+
+# Copyright Louis Paternault 2017
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Paper sizes packed in contiguous buffers.
+
+A :class:`SizeArray` stores paper sizes as a flat sequence of numbers (width
+of the first size, height of the first size, width of the second size, etc.),
+either as doubles (typecode ``d``) or as 64 bits integers (typecode ``q``;
+for instance, with unit ``sp``, as integer scaled points). The underlying
+buffer can be accessed as a :class:`memoryview`, written to (and read from)
+any writable buffer (e.g. :class:`multiprocessing.shared_memory.SharedMemory`)
+and saved to a file which can be memory-mapped back.
+
+The serialized format is a 24 bytes header (magic string, typecode, unit,
+and number of sizes), followed by the numbers, in native byte order.
+
+This module requires Python 3 (importing it with Python 2 raises
+:class:`ImportError`).
+
+>>> sizes = parse(["a4", "letter", "a4"], "mm")
+>>> len(sizes), sizes[0]
+(3, (210.0, 297.0))
+>>> sizes.memoryview().format, sizes.memoryview().nbytes
+('d', 48)
+
+.. autoclass:: SizeArray
+    :members:
+
+.. autofunction:: parse
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+from decimal import Decimal
+import array
+import mmap
+import struct
+import sys
+
+import papersize
+
+if sys.version_info < (3,):
+    raise ImportError("Module 'papersize.packed' requires Python 3.")
+
+TYPECODES = ("d", "q")
+
+_MAGIC = b"PAPERSZ1"
+_HEADER = struct.Struct("=8s1s7sQ")
+
+
+def _converter(typecode):
+    """Return the function converting lengths to items of a buffer."""
+    if typecode == "d":
+        return float
+    return lambda length: int(Decimal(length).to_integral_value())
+
+
+class SizeArray(object):
+    """Array of paper sizes, backed by a contiguous buffer.
+
+    :param str unit: The unit of the sizes, as a key of
+        :data:`papersize.UNITS`.
+    :param str typecode: Type of the items of the buffer: ``d`` (double) or
+        ``q`` (signed 64 bits integer; lengths are rounded).
+    :param data: Flat buffer of numbers (as an :class:`array.array` or a
+        :class:`memoryview` of format ``typecode``). If ``None``, a new empty
+        :class:`array.array` is used. It is not copied.
+
+    Items are couples of numbers (:class:`float` or :class:`int`).
+    Sizes can only be appended if ``data`` is an :class:`array.array`.
+    """
+
+    def __init__(self, unit="pt", typecode="d", data=None):
+        if typecode not in TYPECODES:
+            raise ValueError(
+                "Argument 'typecode' must be one of {}.".format(", ".join(TYPECODES))
+            )
+        if data is None:
+            data = array.array(str(typecode))
+        self.unit = unit
+        self.typecode = typecode
+        self.data = data
+        self._convert = _converter(typecode)
+        self._owner = None
+
+    def __len__(self):
+        return len(self.data) // 2
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return (self.data[2 * index], self.data[2 * index + 1])
+
+    def __iter__(self):
+        iterator = iter(self.data)
+        return zip(iterator, iterator)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def append(self, size):
+        """Append a size (a couple of lengths expressed in :attr:`unit`)."""
+        self.data.append(self._convert(size[0]))
+        self.data.append(self._convert(size[1]))
+
+    def extend(self, sizes):
+        """Append several sizes."""
+        for size in sizes:
+            self.append(size)
+
+    def memoryview(self):
+        """Return a :class:`memoryview` of the buffer (no copy is done)."""
+        return memoryview(self.data)
+
+    @property
+    def nbytes(self):
+        """Size of the serialized array (header included), in bytes."""
+        return _HEADER.size + self.memoryview().nbytes
+
+    def _header(self):
+        """Return the serialized header."""
+        return _HEADER.pack(
+            _MAGIC,
+            self.typecode.encode("ascii"),
+            self.unit.encode("ascii"),
+            len(self),
+        )
+
+    def write(self, buffer):
+        """Serialize the array into a writable buffer.
+
+        :param buffer: Any writable object supporting the buffer protocol (e.g.
+            :class:`bytearray`, :class:`mmap.mmap`, or the ``buf`` attribute of
+            :class:`multiprocessing.shared_memory.SharedMemory`), of at least
+            :attr:`nbytes` bytes.
+        :return: The number of bytes written.
+        """
+        view = memoryview(buffer).cast("B")
+        view[: _HEADER.size] = self._header()
+        view[_HEADER.size : self.nbytes] = self.memoryview().cast("B")
+        return self.nbytes
+
+    def save(self, filename):
+        """Save the array into a file (which can be read by :meth:`load`)."""
+        with open(filename, "wb") as file:
+            file.write(self._header())
+            file.write(self.memoryview())
+
+    def to_shared_memory(self, name=None):
+        """Copy the array into a new shared memory block.
+
+        :param str name: Name of the block (if ``None``, a random name is used).
+        :return: The :class:`multiprocessing.shared_memory.SharedMemory` object.
+            It is up to the caller to close and unlink it.
+        """
+        from multiprocessing import shared_memory
+
+        block = shared_memory.SharedMemory(name=name, create=True, size=self.nbytes)
+        self.write(block.buf)
+        return block
+
+    @classmethod
+    def frombuffer(cls, buffer):
+        """Return an array reading serialized sizes from a buffer, without copy.
+
+        :param buffer: Any object supporting the buffer protocol, containing
+            an array serialized by :meth:`write` or :meth:`save`. It may be
+            longer than the serialized array.
+        """
+        view = memoryview(buffer).cast("B")
+        magic, typecode, unit, length = _HEADER.unpack(view[: _HEADER.size])
+        if magic != _MAGIC:
+            raise ValueError("Buffer does not contain a serialized size array.")
+        typecode = typecode.decode("ascii")
+        data = view[
+            _HEADER.size : _HEADER.size + 2 * length * struct.calcsize(typecode)
+        ].cast(typecode)
+        return cls(unit.rstrip(b"\0").decode("ascii"), typecode, data)
+
+    @classmethod
+    def load(cls, filename):
+        """Memory-map a file saved by :meth:`save` (read only)."""
+        with open(filename, "rb") as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        sizes = cls.frombuffer(data)
+        sizes._owner = data  # pylint: disable = protected-access
+        return sizes
+
+    @classmethod
+    def from_shared_memory(cls, name):
+        """Attach to a shared memory block written by :meth:`to_shared_memory`.
+
+        The block is closed (but not unlinked) by :meth:`close`.
+        """
+        from multiprocessing import shared_memory
+
+        block = shared_memory.SharedMemory(name=name)
+        sizes = cls.frombuffer(block.buf)
+        sizes._owner = block  # pylint: disable = protected-access
+        return sizes
+
+    def close(self):
+        """Release the buffer, and close the file or shared memory block it
+        comes from (if any). The array is no longer usable.
+        """
+        if isinstance(self.data, memoryview):
+            self.data.release()
+        self.data = array.array(str(self.typecode))
+        if self._owner is not None:
+            self._owner.close()
+            self._owner = None
+
+
+def parse(strings, unit="pt", typecode="d"):
+    """Parse paper sizes into a :class:`SizeArray`.
+
+    :param strings: Iterable of strings parsable by
+        :func:`papersize.parse_papersize`.
+    :param str unit: The unit of the sizes.
+    :param str typecode: See :class:`SizeArray`.
+
+    Each distinct string is parsed only once.
+    """
+    sizes = SizeArray(unit, typecode)
+    convert = _converter(typecode)
+    cache = {}
+    for string in strings:
+        if string not in cache:
+            width, height = papersize.parse_papersize(string, unit)
+            cache[string] = (convert(width), convert(height))
+        sizes.data.extend(cache[string])
+    return sizes
@@ -0,0 +1,83 @@
+#!/usr/bin python
+# -*- coding: utf8 -*-
+
+# Copyright Louis Paternault 2017
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Parse paper sizes stored in :mod:`pandas` objects.
+
+This module requires `pandas <https://pandas.pydata.org>`_ (install
+``papersize[pandas]``).
+
+Values of the column are factorized first, so that each distinct value is
+parsed only once, whatever the length of the column.
+
+.. autofunction:: parse
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import numpy
+import pandas
+
+import papersize
+
+
+def _parse_uniques(uniques, unit, errors):
+    """Parse distinct values, and return two arrays of widths and heights.
+
+    An extra ``NaN`` item is appended to both arrays, so that missing values
+    (indexed by ``-1``) are mapped to ``NaN``.
+    """
+    widths = numpy.full(len(uniques) + 1, numpy.nan)
+    heights = numpy.full(len(uniques) + 1, numpy.nan)
+    for index, value in enumerate(uniques):
+        try:
+            widths[index], heights[index] = papersize.parse_papersize(value, unit)
+        except papersize.CouldNotParse:
+            if errors == "raise":
+                raise
+    return widths, heights
+
+
+def parse(series, unit="pt", errors="raise"):
+    """Parse a series of paper sizes.
+
+    :param pandas.Series series: Series of strings, parsable by
+        :func:`papersize.parse_papersize`. Missing values are allowed.
+    :param str unit: The unit of the return values.
+    :param str errors: If ``"raise"``, invalid values raise
+        :class:`papersize.CouldNotParse`; if ``"coerce"``, they are set as
+        ``NaN``.
+    :return: A data frame with the same index as ``series``, and two float
+        columns ``width`` and ``height``. Missing values are ``NaN``.
+    :rtype: :class:`pandas.DataFrame`
+
+    >>> parse(pandas.Series(["a4", "A4", None, "1cm x 2cm"]), "cm")
+       width  height
+    0   21.0    29.7
+    1   21.0    29.7
+    2    NaN     NaN
+    3    1.0     2.0
+    """
+    if errors not in ("raise", "coerce"):
+        raise ValueError("Argument 'errors' must be one of 'raise' or 'coerce'.")
+    codes, uniques = pandas.factorize(series)
+    widths, heights = _parse_uniques(uniques, unit, errors)
+    return pandas.DataFrame(
+        {"width": widths[codes], "height": heights[codes]},
+        index=series.index,
+        columns=["width", "height"],
+    )
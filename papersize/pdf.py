@@ -0,0 +1,326 @@
+#!/usr/bin python
+# -*- coding: utf8 -*-
+
+# Copyright Louis Paternault 2017
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Page sizes of PDF files.
+
+This module reads page sizes of PDF files, without a full PDF parser: files
+are memory-mapped, and scanned for page objects and their ``/MediaBox`` and
+``/CropBox`` arrays (boxes inherited from the page tree are taken into
+account). Page sizes are converted from ``bp`` (the PDF unit), and compared
+to the sizes of :data:`papersize.SIZES`.
+
+Limitations:
+
+- pages are returned in the order they appear in the file, which may not be
+  the order of the document;
+- objects are not looked up using the cross-reference table: if an object is
+  defined several times (e.g. by incremental updates), its last definition is
+  used;
+- compressed object streams (PDF 1.5 and later) are read only if they are
+  compressed using ``FlateDecode`` (a warning is issued for other streams);
+- the ``/Rotate`` entry of pages is ignored.
+
+.. autoclass:: Page
+
+.. autofunction:: iter_pages
+
+.. autofunction:: scan
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+from decimal import Decimal
+import collections
+import functools
+import mmap
+import multiprocessing
+import os
+import re
+import warnings
+import zlib
+
+import papersize
+
+
+class Page(
+    collections.namedtuple("Page", ["filename", "index", "width", "height", "name"])
+):
+    """Size of a PDF page.
+
+    :param str filename: Name of the PDF file.
+    :param int index: Index of the page object in the file (starting from 0).
+    :param decimal.Decimal width: Width of the page.
+    :param decimal.Decimal height: Height of the page.
+    :param str name: Name of the page size (as a key of :data:`papersize.SIZES`),
+        whatever its orientation, or ``None`` if it does not match any known
+        size.
+    """
+
+    __slots__ = ()
+
+
+BOXES = ("MediaBox", "CropBox")
+
+__NUMBER = br"([-+]?(?:\d+(?:\.\d*)?|\.\d+))"
+__OBJECT_COMPILED_RE = re.compile(br"(\d+)\s+\d+\s+obj\b(.*?)\bendobj", re.S)
+__OBJECT_STREAM_COMPILED_RE = re.compile(br"/Type\s*/ObjStm(?![\w])")
+__STREAM_COMPILED_RE = re.compile(br"\bstream(?:\r\n|\n|\r)")
+__FILTER_COMPILED_RE = re.compile(br"/Filter\s*(\[[^\]]*\]|/\w+)")
+__FIRST_COMPILED_RE = re.compile(br"/First\s+(\d+)")
+__N_COMPILED_RE = re.compile(br"/N\s+(\d+)")
+__BOX_COMPILED_RE = re.compile(
+    br"/(MediaBox|CropBox)\s*\[\s*" + br"\s+".join([__NUMBER] * 4) + br"\s*\]"
+)
+__PAGE_COMPILED_RE = re.compile(br"/Type\s*/Page(s?)(?![\w])")
+__PARENT_COMPILED_RE = re.compile(br"/Parent\s+(\d+)\s+\d+\s+R")
+
+_CANDIDATES = {}
+
+
+def _candidates(unit):
+    """Return the list of ``(name, width, height)`` of known sizes, in portrait.
+
+    Sizes are sorted by name. The result is cached, and rebuilt if the content
+    of :data:`papersize.SIZES` has changed since.
+    """
+    try:
+        sizes, candidates = _CANDIDATES[unit]
+        if sizes == papersize.SIZES:
+            return candidates
+    except KeyError:
+        pass
+    candidates = [
+        (name,)
+        + papersize.rotate(papersize.parse_papersize(name, unit), papersize.PORTRAIT)
+        for name in sorted(papersize.SIZES)
+    ]
+    _CANDIDATES[unit] = (dict(papersize.SIZES), candidates)
+    return candidates
+
+
+def _classify(size, unit, tolerance):
+    """Return the name of the known size closest to ``size``, or ``None``.
+
+    Sizes are compared whatever their orientation, and sizes farther than
+    ``tolerance`` (on either dimension) are ignored. On equality, the first
+    name (in alphabetical order) is returned.
+    """
+    width, height = papersize.rotate(size, papersize.PORTRAIT)
+    best = None
+    for name, known_width, known_height in _candidates(unit):
+        distance = max(abs(width - known_width), abs(height - known_height))
+        if distance <= tolerance and (best is None or distance < best[0]):
+            best = (distance, name)
+    if best is None:
+        return None
+    return best[1]
+
+
+def _object_info(body):
+    """Parse the body of an object.
+
+    :return: ``None`` if the object is neither a page nor a page tree node;
+        otherwise a tuple ``(is_page, boxes, parent)``, where ``boxes`` is a
+        dictionary of boxes (as tuples of byte strings), and ``parent`` is the
+        object number of the parent node (or ``None``).
+    """
+    match = __PAGE_COMPILED_RE.search(body)
+    if match is None:
+        return None
+    boxes = {}
+    for box in __BOX_COMPILED_RE.finditer(body):
+        boxes.setdefault(box.group(1).decode("ascii"), box.groups()[1:])
+    parent = __PARENT_COMPILED_RE.search(body)
+    if parent is not None:
+        parent = int(parent.group(1))
+    return (not match.group(1), boxes, parent)
+
+
+def _lookup(box, boxes, parent, nodes):
+    """Return a box of a page, looking up the page tree if necessary.
+
+    :return: The box (as a tuple of byte strings), or ``None`` if it is not
+        defined (or if the page tree is broken or has a cycle).
+    """
+    visited = set()
+    while box not in boxes:
+        if parent not in nodes or parent in visited:
+            return None
+        visited.add(parent)
+        boxes, parent = nodes[parent]
+    return boxes[box]
+
+
+def _resolve(box, boxes, parent, nodes):
+    """Return a box of a page (``CropBox`` defaulting to ``MediaBox``).
+
+    :return: The box (as a tuple of byte strings), or ``None``.
+    """
+    coordinates = _lookup(box, boxes, parent, nodes)
+    if coordinates is None and box == "CropBox":
+        return _lookup("MediaBox", boxes, parent, nodes)
+    return coordinates
+
+
+def _iter_object_stream(filename, body):
+    """Iterate over the objects of an object stream.
+
+    :param str filename: Name of the PDF file (used in warnings).
+    :param bytes body: Body of the object stream.
+    :return: An iterator of couples ``(number, body)``. Nothing is yielded
+        (and a warning is issued) if the stream cannot be read.
+    """
+    try:
+        dictionary, data = __STREAM_COMPILED_RE.split(body, 1)
+        data = data[: data.rindex(b"endstream")]
+        filters = __FILTER_COMPILED_RE.search(dictionary)
+        if filters is not None:
+            filters = re.findall(br"/(\w+)", filters.group(1))
+            if filters != [b"FlateDecode"]:
+                raise ValueError("Unsupported filter.")
+            data = zlib.decompressobj().decompress(data)
+        first = int(__FIRST_COMPILED_RE.search(dictionary).group(1))
+        count = int(__N_COMPILED_RE.search(dictionary).group(1))
+        header = [int(value) for value in data[:first].split()[: 2 * count]]
+    except (ValueError, AttributeError, zlib.error):
+        warnings.warn("{}: An object stream could not be read.".format(filename))
+        return
+    offsets = header[1::2] + [len(data) - first]
+    for number, start, end in zip(header[0::2], offsets, offsets[1:]):
+        yield number, data[first + start : first + end]
+
+
+def _iter_objects(filename, data):
+    """Iterate over the objects of a PDF file (including compressed objects).
+
+    :return: An iterator of couples ``(number, body)``, in the order they
+        appear in the file. Object streams are replaced by their content.
+    """
+    for match in __OBJECT_COMPILED_RE.finditer(data):
+        body = match.group(2)
+        if __OBJECT_STREAM_COMPILED_RE.search(body) is None:
+            yield int(match.group(1)), body
+            continue
+        for number, content in _iter_object_stream(filename, body):
+            yield number, content
+
+
+def iter_pages(filename, unit="pt", box="MediaBox", tolerance="1mm"):
+    """Iterate over the page sizes of a PDF file.
+
+    :param str filename: Name of the PDF file.
+    :param str unit: The unit of the page dimensions.
+    :param str box: Box defining the page size: ``MediaBox`` (the physical
+        page) or ``CropBox`` (the visible region; defaults to ``MediaBox``).
+    :param tolerance: Maximum difference (on each dimension) between the page
+        size and a known size, for the page to be named after it. Either a
+        string parsable by :func:`papersize.parse_length`, or a number
+        expressed in ``unit``.
+    :return: An iterator of :class:`Page` objects, in the order they appear
+        in the file. Pages without a (valid) box are ignored.
+    """
+    if box not in BOXES:
+        raise ValueError("Argument 'box' must be one of {}.".format(", ".join(BOXES)))
+    if isinstance(tolerance, (int, float, Decimal)):
+        tolerance = Decimal(tolerance)
+    else:
+        tolerance = papersize.parse_length(tolerance, unit)
+
+    # Pages and page tree nodes, indexed by object number (the last definition
+    # of an object replaces the previous ones, but keeps its position).
+    objects = collections.OrderedDict()
+    with open(filename, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            for number, body in _iter_objects(filename, data):
+                info = _object_info(body)
+                if info is not None:
+                    objects[number] = info
+                elif number in objects:
+                    del objects[number]
+        finally:
+            data.close()
+
+    nodes = dict(
+        (number, (boxes, parent))
+        for number, (is_page, boxes, parent) in objects.items()
+        if not is_page
+    )
+    cache = {}
+    index = 0
+    for is_page, boxes, parent in objects.values():
+        if not is_page:
+            continue
+        coordinates = _resolve(box, boxes, parent, nodes)
+        if coordinates is not None:
+            if coordinates not in cache:
+                x1, y1, x2, y2 = [
+                    papersize.convert_length(value.decode("ascii"), "bp", unit)
+                    for value in coordinates
+                ]
+                size = (abs(x2 - x1), abs(y2 - y1))
+                cache[coordinates] = size + (_classify(size, unit, tolerance),)
+            yield Page(filename, index, *cache[coordinates])
+        index += 1
+
+
+def _list_pages(filename, **kwargs):
+    """Return the list of page sizes of a PDF file (see :func:`iter_pages`)."""
+    return list(iter_pages(filename, **kwargs))
+
+
+def _iter_files(paths):
+    """Iterate over PDF files: files of ``paths``, and PDF files of directories
+    of ``paths`` (recursively).
+    """
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, __dirs, files in os.walk(path):
+            for name in sorted(files):
+                if name.lower().endswith(".pdf"):
+                    yield os.path.join(root, name)
+
+
+def scan(paths, processes=None, **kwargs):
+    """Iterate over the page sizes of many PDF files, in parallel.
+
+    :param list paths: List of PDF files or directories (searched recursively
+        for files with a ``.pdf`` extension).
+    :param int processes: Number of worker processes (default is the number
+        of CPUs). If ``1``, files are processed in the current process.
+    :param kwargs: Other arguments are passed to :func:`iter_pages`.
+    :return: An iterator of :class:`Page` objects. Pages of a given file are
+        consecutive, but files are processed in no particular order.
+    """
+    function = functools.partial(_list_pages, **kwargs)
+    if processes == 1:
+        for filename in _iter_files(paths):
+            for page in function(filename):
+                yield page
+        return
+    pool = multiprocessing.Pool(processes)
+    try:
+        for pages in pool.imap_unordered(function, _iter_files(paths), chunksize=4):
+            for page in pages:
+                yield page
+    finally:
+        pool.terminate()
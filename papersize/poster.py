@@ -0,0 +1,230 @@
+#!/usr/bin python
+# -*- coding: utf8 -*-
+
+# Copyright Louis Paternault 2017
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Split posters into tiles.
+
+Compute how a large page (a poster) is to be printed as a grid of tiles,
+onto smaller sheets of paper. Each sheet has a margin (which is not printed),
+and adjacent tiles overlap (so that they can be glued together).
+
+>>> tiling = plan_poster("a1", ["a4", "a3", "letter"], margin="5mm", overlap="1cm")
+>>> print(tiling.sheet)
+a3
+>>> tiling.rotated, tiling.columns, tiling.rows, tiling.sheets
+(True, 2, 3, 6)
+
+.. autoclass:: Tiling
+    :members:
+
+.. autofunction:: plan_tiles
+
+.. autofunction:: plan_poster
+
+.. autofunction:: plan_posters
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import collections
+import decimal
+
+import papersize
+
+MINIMIZE = ("sheets", "waste")
+
+
+class Tiling(
+    collections.namedtuple(
+        "Tiling",
+        [
+            "sheet",
+            "rotated",
+            "columns",
+            "rows",
+            "tile_width",
+            "tile_height",
+            "overlap",
+            "waste",
+        ],
+    )
+):
+    """Tiling of a poster.
+
+    :param sheet: Sheet size, as given to the planning function.
+    :param bool rotated: Whether the sheet is rotated (by 90°).
+    :param int columns: Number of columns of tiles.
+    :param int rows: Number of rows of tiles.
+    :param decimal.Decimal tile_width: Width of the printed part of each
+        sheet (that is, the width of the rotated sheet, minus margins).
+    :param decimal.Decimal tile_height: Height of the printed part of each
+        sheet.
+    :param decimal.Decimal overlap: Overlap of adjacent tiles.
+    :param decimal.Decimal waste: Area of paper which is not covered by the
+        poster (margins, overlaps, and tiles extending beyond the poster).
+    """
+
+    __slots__ = ()
+
+    @property
+    def sheets(self):
+        """Number of sheets."""
+        return self.columns * self.rows
+
+    def tiles(self):
+        """Iterate over the positions of tiles on the poster.
+
+        :return: An iterator of couples ``(x, y)``, which are the positions of
+            the bottom left corner of tiles, from the bottom left corner of
+            the poster (row by row, from the bottom one).
+        """
+        for row in range(self.rows):
+            for column in range(self.columns):
+                yield (
+                    column * (self.tile_width - self.overlap),
+                    row * (self.tile_height - self.overlap),
+                )
+
+
+def _count(length, tile, overlap):
+    """Return the number of tiles needed to cover ``length``."""
+    if length <= tile:
+        return 1
+    return int(
+        ((length - overlap) / (tile - overlap)).to_integral_value(
+            rounding=decimal.ROUND_CEILING
+        )
+    )
+
+
+def _plan(poster, sheet, margin, overlap, key):
+    """Compute the best tiling (sizes are couples of decimals).
+
+    The ``sheet`` field of the result is ``None``.
+    """
+    orientations = [papersize.rotate(sheet, papersize.PORTRAIT)]
+    if papersize.rotate(sheet, papersize.LANDSCAPE) != orientations[0]:
+        orientations.append(papersize.rotate(sheet, papersize.LANDSCAPE))
+    candidates = []
+    for turned in orientations:
+        width = turned[0] - 2 * margin
+        height = turned[1] - 2 * margin
+        if width <= overlap or height <= overlap:
+            raise ValueError("Margins and overlap are larger than the sheet.")
+        columns = _count(poster[0], width, overlap)
+        rows = _count(poster[1], height, overlap)
+        candidates.append(
+            Tiling(
+                None,
+                turned != sheet,
+                columns,
+                rows,
+                width,
+                height,
+                overlap,
+                columns * rows * turned[0] * turned[1] - poster[0] * poster[1],
+            )
+        )
+    return min(candidates, key=key)
+
+
+def _key(minimize):
+    """Return the function used to compare tilings."""
+    if minimize == "sheets":
+        return lambda tiling: (tiling.sheets, tiling.waste, tiling.rotated)
+    if minimize == "waste":
+        return lambda tiling: (tiling.waste, tiling.sheets, tiling.rotated)
+    raise ValueError(
+        "Argument 'minimize' must be one of {}.".format(", ".join(MINIMIZE))
+    )
+
+
+def plan_tiles(poster, sheet, margin=0, overlap=0, minimize="sheets", unit="pt"):
+    """Compute the tiling of a poster onto a given sheet.
+
+    :param poster: Size of the poster, as a string parsable by
+        :func:`papersize.parse_papersize`, or as a couple of numbers.
+    :param sheet: Size of the sheet (same format as ``poster``).
+    :param margin: Margin (on every side of the sheets), as a string parsable
+        by :func:`papersize.parse_length`, or as a number.
+    :param overlap: Overlap of adjacent tiles (same format as ``margin``).
+    :param str minimize: Either ``"sheets"`` (minimize the number of sheets,
+        then the waste) or ``"waste"`` (minimize the waste, then the number of
+        sheets).
+    :param str unit: The unit of numbers given as arguments, and of lengths
+        (and areas) of the result.
+    :rtype: :class:`Tiling`
+
+    Both orientations of the sheet (see :func:`papersize.rotate`) are
+    compared. A :class:`ValueError` is raised if margins and overlap leave
+    nothing to print on the sheet.
+    """
+    return _plan(
+        papersize.as_papersize(poster, unit),
+        papersize.as_papersize(sheet, unit),
+        papersize.as_length(margin, unit),
+        papersize.as_length(overlap, unit),
+        _key(minimize),
+    )._replace(sheet=sheet)
+
+
+def plan_poster(poster, sheets, margin=0, overlap=0, minimize="sheets", unit="pt"):
+    """Choose the best sheet to print a poster.
+
+    :param sheets: Iterable of candidate sheet sizes.
+    :rtype: :class:`Tiling`
+
+    Other arguments are the same as :func:`plan_tiles`. On equality, the
+    first sheet is chosen.
+    """
+    return plan_posters([poster], sheets, margin, overlap, minimize, unit)[0]
+
+
+def plan_posters(posters, sheets, margin=0, overlap=0, minimize="sheets", unit="pt"):
+    """Choose the best sheet to print each of several posters.
+
+    :param posters: Iterable of poster sizes.
+    :param sheets: Iterable of candidate sheet sizes.
+    :return: The list of the best :class:`Tiling` of each poster.
+
+    Other arguments are the same as :func:`plan_tiles`. Tilings of a given
+    poster size onto a given sheet size are only computed once.
+    """
+    sheets = [(sheet, papersize.as_papersize(sheet, unit)) for sheet in sheets]
+    if not sheets:
+        raise ValueError("At least one sheet size must be given.")
+    margin = papersize.as_length(margin, unit)
+    overlap = papersize.as_length(overlap, unit)
+    key = _key(minimize)
+
+    sizes = {}
+    tilings = {}
+    result = []
+    for poster in posters:
+        cache_key = tuple(poster) if isinstance(poster, list) else poster
+        if cache_key not in sizes:
+            sizes[cache_key] = papersize.as_papersize(poster, unit)
+        size = sizes[cache_key]
+        candidates = []
+        for sheet, sheet_size in sheets:
+            if (size, sheet_size) not in tilings:
+                tilings[(size, sheet_size)] = _plan(
+                    size, sheet_size, margin, overlap, key
+                )
+            candidates.append(tilings[(size, sheet_size)]._replace(sheet=sheet))
+        result.append(min(candidates, key=key))
+    return result
@@ -0,0 +1,190 @@
+#!/usr/bin python
+# -*- coding: utf8 -*-
+
+# Copyright Louis Paternault 2017
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Import sizes defined by printer drivers.
+
+Two sources are supported:
+
+- `PPD <https://www.cups.org/doc/spec-ppd.html>`_ files, defining sizes as
+  ``*PaperDimension`` entries (imageable areas, defined as
+  ``*ImageableArea`` entries, can be read using
+  :func:`read_imageable_areas`);
+- Ghostscript definitions of sizes (as found in ``gs_statd.ps``), such as
+  ``/a4 {/a4 595 842 //.setpagesize exec} bind def``.
+
+Files are read line by line, and sizes (expressed in ``bp``) are returned as
+catalogs (see :mod:`papersize.catalog`), with lower case names. Loaded files
+are cached (in memory, and optionally on disk as compiled catalogs), and
+only read again if their modification time or size change.
+
+.. autofunction:: load_ppd
+
+.. autofunction:: load_ghostscript
+
+.. autofunction:: read_imageable_areas
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import hashlib
+import os
+import re
+
+import papersize
+from papersize import catalog
+
+__PPD_DIMENSION_COMPILED_RE = re.compile(
+    r'^\*PaperDimension\s+([^/:\s]+)[^:]*:\s*"\s*([\d.]+)\s+([\d.]+)\s*"'
+)
+__PPD_AREA_COMPILED_RE = re.compile(
+    r'^\*ImageableArea\s+([^/:\s]+)[^:]*:\s*"\s*'
+    r'([-\d.]+)\s+([-\d.]+)\s+([-\d.]+)\s+([-\d.]+)\s*"'
+)
+__GS_COMPILED_RE = re.compile(
+    r"^\s*/([^\s{/]+)\s*\{\s*(?:/\S+\s+)?([\d.]+)\s+([\d.]+)\s+//?\.setpagesize\b"
+)
+
+_LOADED = {}
+
+# Python 2 has no os.replace()
+_replace = getattr(os, "replace", os.rename)  # pylint: disable = invalid-name
+
+
+def _read_lines(filename, regexp):
+    """Iterate over the matches of ``regexp`` on lines of a file."""
+    with open(filename, "rb") as file:
+        for line in file:
+            match = regexp.match(line.decode("latin1"))
+            if match is not None:
+                yield match.groups()
+
+
+def _read_ppd(filename):
+    """Return the dictionary of sizes defined in a PPD file."""
+    sizes = {}
+    for name, width, height in _read_lines(filename, __PPD_DIMENSION_COMPILED_RE):
+        sizes.setdefault(name.lower(), "{}bp x {}bp".format(width, height))
+    return sizes
+
+
+def _read_ghostscript(filename):
+    """Return the dictionary of sizes defined in a Ghostscript file."""
+    sizes = {}
+    for name, width, height in _read_lines(filename, __GS_COMPILED_RE):
+        sizes.setdefault(name.lower(), "{}bp x {}bp".format(width, height))
+    return sizes
+
+
+def _load(filename, reader, register, cache_directory):
+    """Load (or get from cache) the catalog of a file.
+
+    :param function reader: Function returning the dictionary of sizes of
+        the file.
+    """
+    path = os.path.abspath(filename)
+    stat = os.stat(path)
+    version = "{}:{}:{}".format(path, stat.st_mtime, stat.st_size)
+
+    if path in _LOADED and _LOADED[path][0] == version:
+        loaded = _LOADED[path][1]
+    elif cache_directory is None:
+        loaded = catalog._DictCatalog(  # pylint: disable = protected-access
+            path, reader(path)
+        )
+    else:
+        # Compiled catalogs are named after the file and its version, so that
+        # previous versions of the same file can be removed.
+        prefix = hashlib.sha1(path.encode("utf8")).hexdigest()
+        compiled = os.path.join(
+            cache_directory,
+            "{}-{}.catalog".format(
+                prefix, hashlib.sha1(version.encode("utf8")).hexdigest()
+            ),
+        )
+        if not os.path.exists(compiled):
+            temporary = "{}.{}.tmp".format(compiled, os.getpid())
+            catalog.compile_catalog(reader(path), temporary)
+            _replace(temporary, compiled)
+            for name in os.listdir(cache_directory):
+                # Temporary files of other processes are left untouched
+                stale = os.path.join(cache_directory, name)
+                if (
+                    name.startswith(prefix + "-")
+                    and name.endswith(".catalog")
+                    and stale != compiled
+                ):
+                    try:
+                        os.remove(stale)
+                    except OSError:
+                        # Removed by another process, or still in use (Windows)
+                        pass
+        loaded = catalog.load_catalog(compiled, "catalog", register=False)
+
+    if path in _LOADED and _LOADED[path][1] is not loaded:
+        # Unregister (and close) the previous version of this file
+        previous = _LOADED[path][1]
+        papersize.CATALOGS[:] = [
+            item for item in papersize.CATALOGS if item is not previous
+        ]
+        previous.close()
+    _LOADED[path] = (version, loaded)
+    if register and not any(item is loaded for item in papersize.CATALOGS):
+        papersize.CATALOGS.append(loaded)
+    return loaded
+
+
+def load_ppd(filename, register=True, cache_directory=None):
+    """Load the sizes (``*PaperDimension`` entries) of a PPD file.
+
+    :param str filename: Name of the PPD file.
+    :param bool register: If ``True``, the catalog is appended to
+        :data:`papersize.CATALOGS` (if it is not already), so that its names
+        are recognized by :func:`papersize.parse_papersize`. If a previous
+        version of this file was registered, it is removed.
+    :param str cache_directory: If not ``None``, an existing directory where
+        parsed files are saved (as compiled catalogs), so that other processes
+        (or later runs) do not have to parse them again.
+    :rtype: :class:`papersize.catalog.Catalog`
+    """
+    return _load(filename, _read_ppd, register, cache_directory)
+
+
+def load_ghostscript(filename, register=True, cache_directory=None):
+    """Load the sizes of a Ghostscript file (e.g. ``gs_statd.ps``).
+
+    Arguments and return value are the same as :func:`load_ppd`.
+    """
+    return _load(filename, _read_ghostscript, register, cache_directory)
+
+
+def read_imageable_areas(filename, unit="pt"):
+    """Return the imageable areas (``*ImageableArea`` entries) of a PPD file.
+
+    :param str filename: Name of the PPD file.
+    :param str unit: The unit of the return values.
+    :return: A dictionary of lower case names, and tuples ``(left, bottom,
+        right, top)`` of the coordinates of the imageable area, as
+        :class:`decimal.Decimal`.
+    """
+    areas = {}
+    for groups in _read_lines(filename, __PPD_AREA_COMPILED_RE):
+        areas.setdefault(
+            groups[0].lower(),
+            tuple(papersize.convert_length(value, "bp", unit) for value in groups[1:]),
+        )
+    return areas
@@ -0,0 +1,334 @@
+#!/usr/bin python
+# -*- coding: utf8 -*-
+
+# Copyright Louis Paternault 2017
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Record and replay calls to this library.
+
+A :class:`Recorder` logs (a sample of) the calls to
+:func:`papersize.convert_length`, :func:`papersize.parse_length`,
+:func:`papersize.parse_couple` and :func:`papersize.parse_papersize` made by
+a program, with their results, into a trace file. Only calls made from
+outside those functions are recorded (e.g. the calls to
+:func:`papersize.parse_couple` made by :func:`papersize.parse_papersize` are
+not).
+
+This trace can then be replayed (see :func:`replay`) against the current
+implementation (or any object providing the same functions), to measure its
+throughput and latency, and check that results have not changed.
+
+Trace files contain one JSON list per line (function name, positional
+arguments, keyword arguments, result); they are compressed if their name
+ends with ``.gz``.
+
+This module can also be run as a script to replay a trace::
+
+    python -m papersize.trace trace.jsonl.gz
+
+.. autoclass:: Recorder
+    :members:
+
+.. autoclass:: Report
+
+.. autofunction:: replay
+"""
+
+from __future__ import absolute_import, division, unicode_literals
+
+from decimal import Decimal
+import argparse
+import collections
+import functools
+import gzip
+import importlib
+import io
+import json
+import math
+import random
+import threading
+import time
+
+import papersize
+
+FUNCTIONS = ("convert_length", "parse_length", "parse_couple", "parse_papersize")
+
+_LOCAL = threading.local()
+
+try:
+    _clock = time.perf_counter  # pylint: disable = invalid-name
+except AttributeError:
+    _clock = time.time  # pylint: disable = invalid-name
+
+
+def _open(filename, mode):
+    """Open a (possibly compressed) text file."""
+    if filename.endswith(".gz"):
+        stream = gzip.open(filename, mode + "b")
+        if mode == "r":
+            # Python 2 gzip files do not implement read1()
+            stream = io.BufferedReader(stream)
+        return io.TextIOWrapper(stream, encoding="utf8")
+    return io.open(filename, mode, encoding="utf8")
+
+
+def _encode(value):
+    """Convert a value into something which can be serialized as JSON."""
+    if isinstance(value, Decimal):
+        return {"decimal": str(value)}
+    if isinstance(value, (tuple, list)):
+        return [_encode(item) for item in value]
+    return value
+
+
+def _decode(value):
+    """Convert back a value converted by :func:`_encode`."""
+    if isinstance(value, dict) and "decimal" in value:
+        return Decimal(value["decimal"])
+    if isinstance(value, list):
+        return tuple(_decode(item) for item in value)
+    return value
+
+
+def _error(error):
+    """Return the value recorded when a call raises ``error``."""
+    return {"error": type(error).__name__}
+
+
+class Recorder(object):
+    """Record calls to the parsing functions into a trace file.
+
+    :param str filename: Name of the trace file (overwritten).
+    :param float sample: Proportion of (randomly chosen) calls to record.
+    :param int buffer_size: Number of records kept in memory before being
+        written to the file.
+
+    Recording starts with :meth:`start` and stops with :meth:`stop` (or
+    using the recorder as a context manager).
+
+    Functions are replaced as attributes of the :mod:`papersize` module: calls
+    made through references taken before recording started (e.g. after ``from
+    papersize import parse_papersize``, or by :mod:`papersize.cache`) are not
+    recorded.
+    """
+
+    def __init__(self, filename, sample=1, buffer_size=1000):
+        self.filename = filename
+        self.sample = sample
+        self.buffer_size = buffer_size
+        self._buffer = []
+        self._file = None
+        self._originals = {}
+        # Reentrant: flush() is called by _record()
+        self._lock = threading.RLock()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self):
+        """Start recording (the functions of :mod:`papersize` are replaced)."""
+        self._file = _open(self.filename, "w")
+        for name in FUNCTIONS:
+            self._originals[name] = getattr(papersize, name)
+            setattr(papersize, name, self._wrap(name, self._originals[name]))
+
+    def stop(self):
+        """Stop recording, and write remaining records to the file.
+
+        Nothing is done if recording is not started.
+        """
+        if self._file is None:
+            return
+        for name, function in self._originals.items():
+            setattr(papersize, name, function)
+        self._originals = {}
+        self.flush()
+        self._file.close()
+        self._file = None
+
+    def flush(self):
+        """Write buffered records to the file."""
+        with self._lock:
+            buffer, self._buffer = self._buffer, []
+            for record in buffer:
+                self._file.write(
+                    "{}\n".format(json.dumps(record, separators=(",", ":")))
+                )
+
+    def _record(self, name, args, kwargs, result):
+        """Buffer a record."""
+        record = [
+            name,
+            _encode(args),
+            dict((key, _encode(value)) for key, value in kwargs.items()),
+            result,
+        ]
+        with self._lock:
+            self._buffer.append(record)
+            if len(self._buffer) >= self.buffer_size:
+                self.flush()
+
+    def _wrap(self, name, function):
+        """Return a function recording calls to ``function``."""
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            """Call the original function, and (maybe) record the call."""
+            if getattr(_LOCAL, "depth", 0):
+                # Nested call
+                return function(*args, **kwargs)
+            _LOCAL.depth = 1
+            try:
+                if random.random() >= self.sample:
+                    return function(*args, **kwargs)
+                try:
+                    result = function(*args, **kwargs)
+                except Exception as error:
+                    self._record(name, args, kwargs, _error(error))
+                    raise
+                self._record(name, args, kwargs, _encode(result))
+                return result
+            finally:
+                _LOCAL.depth = 0
+
+        return wrapper
+
+
+class Report(
+    collections.namedtuple(
+        "Report", ["calls", "skipped", "seconds", "latencies", "mismatches"]
+    )
+):
+    """Result of :func:`replay`.
+
+    :param int calls: Number of calls made.
+    :param int skipped: Number of records which were not replayed, because the
+        backend does not provide the corresponding function.
+    :param float seconds: Total time spent in calls.
+    :param dict latencies: Latency percentiles (in seconds), indexed by
+        percentile (e.g. ``latencies[99]``).
+    :param list mismatches: List of records whose replay gave a different
+        result, as tuples ``(function, args, kwargs, expected, result)``.
+    """
+
+    __slots__ = ()
+
+    @property
+    def throughput(self):
+        """Number of calls per second."""
+        if self.seconds == 0:
+            return float("inf")
+        return self.calls / self.seconds
+
+
+def _percentile(values, percentile):
+    """Return a percentile (nearest-rank method) of a sorted list."""
+    if not values:
+        return 0
+    return values[max(0, int(math.ceil(percentile * len(values) / 100)) - 1)]
+
+
+def replay(filename, backend=papersize, repeat=1, percentiles=(50, 90, 99, 99.9)):
+    """Replay a trace.
+
+    :param str filename: Name of the trace file.
+    :param backend: Object providing (some of) the functions of
+        :data:`FUNCTIONS` (default is :mod:`papersize`; it can be, for
+        instance, a :class:`papersize.cache.PersistentCache`).
+    :param int repeat: Number of times the trace is replayed.
+    :param percentiles: Latency percentiles to compute.
+    :rtype: :class:`Report`
+
+    Results are compared by value (e.g. ``Decimal('2.1E+2')`` and
+    ``Decimal('210')`` are considered equal).
+    """
+    with _open(filename, "r") as file:
+        records = [json.loads(line) for line in file if line.strip()]
+
+    functions = dict((name, getattr(backend, name, None)) for name in FUNCTIONS)
+    latencies = []
+    mismatches = []
+    skipped = 0
+    for iteration in range(repeat):
+        for name, args, kwargs, expected in records:
+            function = functions.get(name)
+            if function is None:
+                skipped += 1
+                continue
+            args = _decode(args)
+            kwargs = dict((key, _decode(value)) for key, value in kwargs.items())
+            start = _clock()
+            try:
+                result = function(*args, **kwargs)
+            except Exception as error:  # pylint: disable = broad-except
+                result = _error(error)
+            latencies.append(_clock() - start)
+            if iteration == 0 and _decode(_encode(result)) != _decode(expected):
+                mismatches.append((name, args, kwargs, _decode(expected), result))
+
+    seconds = sum(latencies)
+    latencies.sort()
+    return Report(
+        len(latencies),
+        skipped,
+        seconds,
+        dict(
+            (percentile, _percentile(latencies, percentile))
+            for percentile in percentiles
+        ),
+        mismatches,
+    )
+
+
+def main(arguments=None):
+    """Replay a trace file, and print a report."""
+    parser = argparse.ArgumentParser(
+        prog="python -m papersize.trace", description="Replay a trace file."
+    )
+    parser.add_argument("trace", help="Trace file.")
+    parser.add_argument(
+        "-b",
+        "--backend",
+        default="papersize",
+        help="Module providing the functions to replay (default: papersize).",
+    )
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=1, help="Number of replays."
+    )
+    options = parser.parse_args(arguments)
+
+    report = replay(
+        options.trace, importlib.import_module(options.backend), options.repeat
+    )
+    print("Calls: {} ({} skipped)".format(report.calls, report.skipped))
+    print("Throughput: {:.0f} calls/s".format(report.throughput))
+    for percentile, latency in sorted(report.latencies.items()):
+        print("Latency p{}: {:.2f} µs".format(percentile, latency * 1e6))
+    print("Mismatches: {}".format(len(report.mismatches)))
+    for name, args, kwargs, expected, result in report.mismatches:
+        print(
+            "  {}(*{!r}, **{!r}): expected {!r}, got {!r}".format(
+                name, args, kwargs, expected, result
+            )
+        )
+    return 1 if report.mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -41,6 +41,7 @@ setup(
     packages=find_packages(exclude=["test*"]),
     setup_requires=["hgtools"],
     install_requires=[],
+    extras_require={"pandas": ["pandas"], "arrow": ["numpy", "pyarrow"]},
     include_package_data=True,
     author="Louis Paternault",
     author_email="spalax+python@gresille.org",
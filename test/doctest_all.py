@@ -18,6 +18,7 @@
 """Tests"""
 
 import doctest
+import importlib
 import pkgutil
 import sys
 
@@ -26,9 +27,11 @@ import papersize
 
 def load_module(module_finder, name):
     """Load and return module `name`."""
-    if sys.version_info >= (3, 4, 0):
-        return module_finder.find_spec(name).loader.load_module()
-    return module_finder.find_module(name).load_module(name)
+    # pylint: disable = unused-argument
+    # Submodules are imported (rather than loaded) so that they are set as
+    # attributes of their package, which Python 2 needs for `from papersize import
+    # submodule` to work.
+    return importlib.import_module(name)
 
 
 def load_tests(__loader, tests, __pattern):
@@ -44,7 +47,8 @@ def load_tests(__loader, tests, __pattern):
         else:
             try:
                 module = load_module(module_finder, name)
-            except ImportError:
+            except (ImportError, SyntaxError):
+                # Missing optional dependency, or unsupported python version
                 continue
         try:
             tests.addTests(doctest.DocTestSuite(module))
@@ -39,6 +39,65 @@ class TestDefinition(unittest.TestCase):
             )
 
 
+class TestSeries(unittest.TestCase):
+    """Test ISO series."""
+
+    # pylint: disable = invalid-name
+
+    def testSeries(self):
+        """Test that computed sizes match published ones."""
+        for (name, size) in [
+            ("4a0", "1682mm x 2378mm"),
+            ("a4", "210mm x 297mm"),
+            ("a10", "26mm x 37mm"),
+            ("b0", "1000mm x 1414mm"),
+            ("b4", "250mm x 353mm"),
+            ("b10", "31mm x 44mm"),
+            ("c0", "917mm x 1297mm"),
+            ("c6", "114mm x 162mm"),
+            ("c10", "28mm x 40mm"),
+        ]:
+            self.assertEqual(papersize.SIZES[name], size)
+
+    def testOutsideTable(self):
+        """Test sizes which are not in :data:`papersize.SIZES`."""
+        for (name, result) in [
+            ("a11", (18, 26)),
+            ("8A0", (2378, 3364)),
+            ("b11", (22, 31)),
+            ("c11", (20, 28)),
+        ]:
+            self.assertNotIn(name.lower(), papersize.SIZES)
+            self.assertEqual(papersize.parse_papersize(name, "mm"), result)
+
+        for name in [
+            "1a0",
+            "3a0",
+            "a01",
+            "d4",
+            "a100",
+            "a999999999",
+            "{}a0".format(2 ** 64),
+            "9" * 5000 + "a0",
+            "a" + "9" * 5000,
+        ]:
+            self.assertRaises(papersize.CouldNotParse, papersize.parse_papersize, name)
+
+    def testIterSeries(self):
+        """Test :func:`papersize.iter_series`."""
+        self.assertEqual(
+            dict(papersize.iter_series("a", -2, 10)),
+            dict(
+                (key, value)
+                for (key, value) in papersize.SIZES.items()
+                if key in ["4a0", "2a0"] or (key[0] == "a" and key[1:].isdigit())
+            ),
+        )
+        sizes = list(papersize.iter_series("c", 15))
+        self.assertEqual(sizes[0][0], "c15")
+        self.assertNotEqual(sizes[-1][1].split("mm")[0], "0")
+
+
 class TestParse(unittest.TestCase):
     """Test parsing related functions."""
 
@@ -104,12 +163,147 @@ class TestParse(unittest.TestCase):
             papersize.CouldNotParse, papersize.parse_papersize, "Hello, world!"
         )
 
+    def testIntern(self):
+        """Test interning of parsed sizes."""
+        sizes = [
+            papersize.parse_papersize(string, "mm", intern=True)
+            for string in ["a4", "A4", "210mm x 297mm", "21cm 29.7cm"]
+        ]
+        self.assertTrue(all(size is sizes[0] for size in sizes))
+        self.assertEqual(sizes[0], (210, 297))
+
+        self.assertIsNot(
+            papersize.parse_papersize("a4", intern=True),
+            papersize.parse_papersize("a4", intern=False),
+        )
+        self.assertIsNot(
+            papersize.parse_couple("1cm 1cm", "cm", intern=True),
+            papersize.parse_couple("10mm 10mm", "mm", intern=True),
+        )
+
     def testConvertLength(self):
         """Test :func:`papersize.convert_length`."""
         for (args, result) in [((10, "cm", "mm"), 100), ((1, "mm", "pt"), 2.845275591)]:
             self.assertAlmostEqual(papersize.convert_length(*args), Decimal(result))
 
 
+class TestFormat(unittest.TestCase):
+    """Test formatting related functions."""
+
+    # pylint: disable = invalid-name
+
+    def testFormatLength(self):
+        """Test :func:`papersize.format_length`."""
+        for (args, result) in [
+            ((Decimal("1E+1"), "mm"), "10mm"),
+            ((Decimal("1.0E+2"),), "100pt"),
+            ((Decimal("0.000015"), "sp"), "0.000015sp"),
+            ((Decimal("29.70"), "cm"), "29.7cm"),
+            ((Decimal("2.845275591"), "pt", 3), "2.845pt"),
+            ((12, "pc", 2), "12pc"),
+        ]:
+            self.assertEqual(papersize.format_length(*args), result)
+
+        self.assertEqual(papersize.format_length(Decimal("-0"), "mm"), "0mm")
+        for args in [
+            (Decimal("-1.5"), "mm"),
+            (Decimal("NaN"), "mm"),
+            (Decimal("Infinity"),),
+            (Decimal("1E+30"), "pt", 2),
+            (1, "foo"),
+        ]:
+            self.assertRaises(ValueError, papersize.format_length, *args)
+        self.assertRaises(ValueError, papersize.format_papersize, (1, 2), "foo")
+
+    def testRoundTrip(self):
+        """Test that parsing formatted sizes gives back the same values."""
+        for unit in papersize.UNITS:
+            for name in papersize.SIZES:
+                size = papersize.parse_papersize(name, unit)
+                for name_if_known in (True, False):
+                    self.assertEqual(
+                        papersize.parse_papersize(
+                            papersize.format_papersize(size, unit, name_if_known),
+                            unit,
+                        ),
+                        size,
+                    )
+                for length in size:
+                    self.assertEqual(
+                        papersize.parse_length(
+                            papersize.format_length(length, unit), unit
+                        ),
+                        length,
+                    )
+
+    def testFormatPapersize(self):
+        """Test :func:`papersize.format_papersize`."""
+        self.assertEqual(
+            papersize.format_papersize(papersize.parse_papersize("a4", "mm"), "mm"),
+            "a4",
+        )
+        self.assertEqual(
+            papersize.format_papersize((Decimal("297"), Decimal("210")), "mm"),
+            "297mm x 210mm",
+        )
+        self.assertEqual(
+            papersize.format_papersize(
+                (Decimal("20.99"), Decimal("29.71")), "cm", precision=1
+            ),
+            "a4",
+        )
+
+        # Names are not used anymore once their size has changed
+        a4 = papersize.SIZES["a4"]
+        try:
+            papersize.SIZES["a4"] = "1mm x 1mm"
+            self.assertEqual(
+                papersize.format_papersize((210, 297), "mm"), "210mm x 297mm"
+            )
+        finally:
+            papersize.SIZES["a4"] = a4
+        self.assertEqual(papersize.format_papersize((210, 297), "mm"), "a4")
+
+    def testBatch(self):
+        """Test batch formatting functions."""
+        lengths = [Decimal(i) / 4 for i in range(10)] * 3
+        self.assertEqual(
+            list(papersize.format_lengths(lengths, "cm")),
+            [papersize.format_length(length, "cm") for length in lengths],
+        )
+        sizes = [papersize.parse_papersize(name, "in") for name in papersize.SIZES]
+        self.assertEqual(
+            list(papersize.format_papersizes(sizes * 2, "in", False)),
+            [papersize.format_papersize(size, "in", False) for size in sizes * 2],
+        )
+        self.assertEqual(
+            list(papersize.format_papersizes([[1, 2], [1, 2]], "mm")),
+            ["1mm x 2mm", "1mm x 2mm"],
+        )
+        self.assertRaises(
+            ValueError, list, papersize.format_lengths([Decimal("sNaN")], "mm")
+        )
+
+    def testBatchCacheSize(self):
+        """Test that batch formatting functions only cache the last items."""
+        # pylint: disable = protected-access
+        cache_size = papersize._FORMAT_CACHE_SIZE
+        try:
+            papersize._FORMAT_CACHE_SIZE = 3
+            calls = []
+
+            def function(item):
+                """Return ``item``, and remember it was called."""
+                calls.append(item)
+                return item
+
+            items = [1, 2, 1, 3, 4, 5, 1, 2, 6, 2]
+            self.assertEqual(list(papersize._format_many(function, items)), items)
+            self.assertEqual(calls, [1, 2, 3, 4, 5, 1, 2, 6])
+        finally:
+            papersize._FORMAT_CACHE_SIZE = cache_size
+
+
 class TestOrientation(unittest.TestCase):
     """Test orientation related tools."""
 
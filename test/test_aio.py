@@ -0,0 +1,165 @@
+#!/usr/bin python
+
+# Copyright 2017 Louis Paternault
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of asyncio adapters
+
+This file must be importable by every supported python version: it does not
+use the ``async`` syntax.
+"""
+
+import sys
+import unittest
+
+import papersize
+
+try:
+    import asyncio
+    import concurrent.futures
+    import types
+
+    from papersize import aio
+except (ImportError, SyntaxError):
+    aio = None
+
+
+class _Source(object):
+    """Asynchronous iterator over ``strings``.
+
+    If ``delay`` is ``None``, items are available at once (without giving
+    control back to the event loop).
+    """
+
+    def __init__(self, strings, delay=None):
+        self.strings = iter(strings)
+        self.delay = delay
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        future = asyncio.get_event_loop().create_future()
+        try:
+            string = next(self.strings)
+        except StopIteration:
+            future.set_exception(StopAsyncIteration())
+            return future
+        if self.delay is None:
+            future.set_result(string)
+            return future
+        return asyncio.sleep(self.delay, result=string)
+
+
+def _consume(iterator, callback):
+    """Coroutine calling ``callback`` on each item of an asynchronous iterator.
+
+    This is ``async for item in iterator: callback(item)``, written as a
+    generator (delegating to ``__anext__()`` by hand), so that this file can be
+    compiled by older python versions.
+    """
+    while True:
+        awaiting = iterator.__anext__().__await__()
+        value = None
+        try:
+            while True:
+                value = yield awaiting.send(value)
+        except StopIteration as stop:
+            callback(stop.value)
+        except StopAsyncIteration:
+            return
+
+
+def _collect(iterator):
+    """Return the list of items of an asynchronous iterator."""
+    items = []
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(types.coroutine(_consume)(iterator, items.append))
+        loop.run_until_complete(loop.shutdown_asyncgens())
+    finally:
+        loop.close()
+    return items
+
+
+@unittest.skipIf(
+    aio is None or sys.version_info < (3, 7), "papersize.aio requires Python 3.7"
+)
+class TestAsyncio(unittest.TestCase):
+    """Test :mod:`papersize.aio`."""
+
+    # pylint: disable = invalid-name
+
+    strings = ["a4", "letter", "1cm 2cm", "A4"] * 5
+
+    def testStream(self):
+        """Test :func:`papersize.aio.aparse_stream`."""
+        self.assertEqual(
+            _collect(aio.aparse_stream(_Source(self.strings), "mm")),
+            [papersize.parse_papersize(string, "mm") for string in self.strings],
+        )
+
+    def testBatches(self):
+        """Test :func:`papersize.aio.aparse_batches`."""
+        for timeout in (None, 10):
+            batches = _collect(
+                aio.aparse_batches(_Source(self.strings), batch_size=3, timeout=timeout)
+            )
+            self.assertEqual([len(batch) for batch in batches], [3] * 6 + [2])
+
+    def testExecutor(self):
+        """Test parsing in an executor."""
+        with concurrent.futures.ThreadPoolExecutor(2) as pool:
+            for executor in ["default", pool]:
+                self.assertEqual(
+                    _collect(
+                        aio.aparse_stream(
+                            _Source(self.strings), batch_size=7, executor=executor
+                        )
+                    ),
+                    [papersize.parse_papersize(string) for string in self.strings],
+                )
+
+    def testTimeout(self):
+        """Test that incomplete batches are parsed when the source is slow."""
+        batches = _collect(
+            aio.aparse_batches(
+                _Source(["a4", "a5"], delay=0.05), batch_size=10, timeout=0.01
+            )
+        )
+        self.assertEqual([len(batch) for batch in batches], [1, 1])
+
+    def testInterleaving(self):
+        """Test that other callbacks run between batches."""
+        events = []
+        loop = asyncio.new_event_loop()
+
+        def tick():
+            """Record ticks, forever."""
+            events.append("tick")
+            loop.call_soon(tick)
+
+        try:
+            loop.call_soon(tick)
+            loop.run_until_complete(
+                types.coroutine(_consume)(
+                    aio.aparse_batches(_Source(self.strings), batch_size=5),
+                    lambda batch: events.append("batch"),
+                )
+            )
+        finally:
+            loop.close()
+        self.assertEqual(events.count("batch"), 4)
+        self.assertNotIn(("batch", "batch"), list(zip(events, events[1:])))
@@ -0,0 +1,103 @@
+#!/usr/bin python
+
+# Copyright 2017 Louis Paternault
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of persistent cache"""
+
+from __future__ import unicode_literals
+import multiprocessing
+import os
+import shutil
+import tempfile
+import unittest
+
+import papersize
+from papersize import cache
+
+
+def _fill(filename, strings):
+    """Parse strings using a persistent cache (run in a child process)."""
+    with cache.PersistentCache(filename) as persistent:
+        for string in strings:
+            persistent.parse_couple(string)
+
+
+class TestCache(unittest.TestCase):
+    """Test :class:`papersize.cache.PersistentCache`."""
+
+    # pylint: disable = invalid-name
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, "cache.sqlite")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testParse(self):
+        """Test that cached results are the same as non-cached ones."""
+        with cache.PersistentCache(self.filename) as persistent:
+            for (function, string, unit) in [
+                ("parse_papersize", "A4", "mm"),
+                ("parse_papersize", "a4", "cm"),
+                ("parse_papersize", "1in 2in", "pt"),
+                ("parse_couple", "1in 2in", "pt"),
+            ]:
+                self.assertEqual(
+                    getattr(persistent, function)(string, unit),
+                    getattr(papersize, function)(string, unit),
+                )
+            self.assertEqual(len(persistent), 4)
+            self.assertRaises(
+                papersize.CouldNotParse, persistent.parse_papersize, "foo"
+            )
+
+        with cache.PersistentCache(self.filename) as persistent:
+            self.assertEqual(len(persistent), 4)
+            self.assertEqual(
+                repr(persistent.parse_papersize("a4", "mm")),
+                repr(papersize.parse_papersize("a4", "mm")),
+            )
+
+    def testVersion(self):
+        """Test that results of other versions are ignored."""
+        with cache.PersistentCache(self.filename) as persistent:
+            persistent.parse_papersize("a4")
+        papersize.SIZES["testversion"] = "1cm 1cm"
+        try:
+            with cache.PersistentCache(self.filename) as persistent:
+                self.assertEqual(len(persistent), 0)
+                persistent.parse_papersize("a5")
+                persistent.prune()
+        finally:
+            del papersize.SIZES["testversion"]
+        with cache.PersistentCache(self.filename) as persistent:
+            self.assertEqual(len(persistent), 0)
+
+    def testProcesses(self):
+        """Test concurrent access from several processes."""
+        strings = ["{}cm {}cm".format(i, i + 1) for i in range(50)]
+        processes = [
+            multiprocessing.Process(target=_fill, args=(self.filename, strings))
+            for __ in range(4)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+            self.assertEqual(process.exitcode, 0)
+        with cache.PersistentCache(self.filename) as persistent:
+            self.assertEqual(len(persistent), 50)
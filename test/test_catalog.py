@@ -0,0 +1,133 @@
+#!/usr/bin python
+
+# Copyright 2017 Louis Paternault
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of external catalogs"""
+
+from __future__ import unicode_literals
+import os
+import shutil
+import tempfile
+import unittest
+
+import papersize
+from papersize import catalog
+
+try:
+    import tomllib
+except ImportError:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+CATALOGS = {
+    "json": '{"Stock1": "10cm x 20cm", "stock2": "a4"}',
+    "toml": 'Stock1 = "10cm x 20cm"\nstock2 = "a4"\n',
+    "csv": "# Comment\nStock1, 10cm x 20cm\r\n\nstock2,a4",
+}
+
+
+class TestCatalog(unittest.TestCase):
+    """Test :mod:`papersize.catalog`."""
+
+    # pylint: disable = invalid-name
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        for item in papersize.CATALOGS:
+            item.close()
+        del papersize.CATALOGS[:]
+        shutil.rmtree(self.directory)
+
+    def _write(self, extension, content):
+        """Write a catalog file, and return its name."""
+        filename = os.path.join(self.directory, "catalog." + extension)
+        with open(filename, "wb") as file:
+            file.write(content.encode("utf8"))
+        return filename
+
+    def assertCatalog(self, loaded):
+        """Check the content of a loaded catalog."""
+        self.assertEqual(sorted(loaded), ["stock1", "stock2"])
+        self.assertEqual(loaded["stock2"], "a4")
+        self.assertNotIn("stock3", loaded)
+        self.assertEqual(papersize.parse_papersize("STOCK1", "cm"), (10, 20))
+        self.assertEqual(
+            papersize.parse_papersize("stock2"), papersize.parse_papersize("a4")
+        )
+
+    def testFormats(self):
+        """Test loading catalogs of every format."""
+        for extension, content in CATALOGS.items():
+            if extension == "toml" and tomllib is None:
+                continue
+            self.assertCatalog(catalog.load_catalog(self._write(extension, content)))
+            del papersize.CATALOGS[:]
+
+        self.assertRaises(
+            ValueError, catalog.load_catalog, self._write("txt", ""), register=False
+        )
+
+    def testCompiled(self):
+        """Test compiled catalogs."""
+        source = catalog.load_catalog(
+            self._write("csv", CATALOGS["csv"]), register=False
+        )
+        filename = os.path.join(self.directory, "compiled.catalog")
+        catalog.compile_catalog(source, filename)
+        compiled = catalog.load_catalog(filename)
+        self.assertEqual(len(compiled), 2)
+        self.assertCatalog(compiled)
+
+        sizes = dict(("size{}".format(i), "{}mm {}mm".format(i, i)) for i in range(500))
+        catalog.compile_catalog(sizes, filename)
+        compiled = catalog.load_catalog(filename, register=False)
+        self.assertEqual(dict(compiled.items()), sizes)
+        for name in ["size", "size9999", "", "z"]:
+            self.assertNotIn(name, compiled)
+
+        self.assertRaises(
+            ValueError, catalog.load_catalog, self._write("catalog", "not a catalog")
+        )
+
+    def testPriority(self):
+        """Test that built-in sizes have priority over catalogs."""
+        catalog.load_catalog(self._write("json", '{"a4": "1cm 1cm"}'))
+        self.assertEqual(papersize.parse_papersize("a4", "mm"), (210, 297))
+
+    def testReferences(self):
+        """Test catalog entries referring to names."""
+        catalog.load_catalog(
+            self._write(
+                "json",
+                '{"foo": "FOO", "bar": "baz", "baz": "b5", "big": "8a0", "x": "1mmx1mm"}',
+            )
+        )
+        self.assertEqual(papersize.parse_papersize("big", "mm"), (2378, 3364))
+        self.assertEqual(papersize.parse_papersize("baz", "mm"), (176, 250))
+        for name in ["foo", "bar"]:
+            self.assertRaises(papersize.CouldNotParse, papersize.parse_papersize, name)
+
+    def testAbstract(self):
+        """Test that incomplete catalogs cannot be instantiated."""
+
+        class Incomplete(catalog.Catalog):
+            """Catalog without any method."""
+
+        self.assertRaises(TypeError, Incomplete, self._write("csv", ""))
@@ -0,0 +1,88 @@
+#!/usr/bin python
+
+# Copyright 2017 Louis Paternault
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of clustering"""
+
+from __future__ import unicode_literals
+from decimal import Decimal
+import random
+import unittest
+
+import papersize
+from papersize import cluster
+
+
+class TestCluster(unittest.TestCase):
+    """Test :mod:`papersize.cluster`."""
+
+    # pylint: disable = invalid-name
+
+    def testNoise(self):
+        """Test that noisy sizes are grouped."""
+        generator = random.Random(0)
+        formats = [(595.28, 841.89), (612, 792), (1000, 1000), (300.5, 400.5)]
+        sizes = []
+        for index, (width, height) in enumerate(formats):
+            for __ in range(100 * (index + 1)):
+                size = (
+                    width + generator.uniform(-0.2, 0.2),
+                    height + generator.uniform(-0.2, 0.2),
+                )
+                if generator.random() < 0.5:
+                    size = size[::-1]
+                sizes.append(size)
+        generator.shuffle(sizes)
+
+        clusters = cluster.cluster(sizes, 0.5)
+        self.assertEqual([item.count for item in clusters], [400, 300, 200, 100])
+        for item, (width, height) in zip(clusters, reversed(formats)):
+            self.assertAlmostEqual(item.width, width, delta=0.1)
+            self.assertAlmostEqual(item.height, height, delta=0.1)
+
+    def testCellBorders(self):
+        """Test sizes close to each other, but in different cells."""
+        self.assertEqual(
+            [item.count for item in cluster.cluster([(9.9, 20), (10.1, 20)], 1)],
+            [2],
+        )
+        self.assertEqual(
+            [item.count for item in cluster.cluster([(9, 20), (10.1, 20)], 1)],
+            [1, 1],
+        )
+
+    def testStream(self):
+        """Test that sizes can be read from an iterator."""
+        sizes = [(10 + index % 7, 20 + index % 3) for index in range(2500)]
+        clusterer = cluster.Clusterer(1)
+        clusterer.update(sizes)
+        self.assertEqual(
+            cluster.cluster(iter(sizes), 1),
+            clusterer.clusters(),
+        )
+
+    def testClusterer(self):
+        """Test :class:`papersize.cluster.Clusterer`."""
+        clusterer = cluster.Clusterer(Decimal("0.1"))
+        clusterer.update(
+            papersize.parse_papersize(name, "mm") for name in "a4 A4".split()
+        )
+        clusterer.add(papersize.parse_papersize("1cm 2cm", "mm"), count=5)
+        self.assertEqual(
+            clusterer.clusters(),
+            [cluster.Cluster(10, 20, 5), cluster.Cluster(210, 297, 2)],
+        )
+        self.assertRaises(ValueError, cluster.Clusterer, 0)
@@ -0,0 +1,109 @@
+#!/usr/bin python
+
+# Copyright 2017 Louis Paternault
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of pandas and arrow integration"""
+
+from __future__ import unicode_literals
+import unittest
+
+import papersize
+
+try:
+    import pandas
+    from papersize import pandas as papersize_pandas
+except ImportError:
+    pandas = None
+
+try:
+    import pyarrow
+    from papersize import arrow as papersize_arrow
+except ImportError:
+    pyarrow = None
+
+
+@unittest.skipIf(pandas is None, "pandas is not installed")
+class TestPandas(unittest.TestCase):
+    """Test :mod:`papersize.pandas`."""
+
+    # pylint: disable = invalid-name
+
+    def testParse(self):
+        """Test :func:`papersize.pandas.parse`."""
+        series = pandas.Series(["a4", "letter", None, "a4"] * 5, index=range(5, 25))
+        frame = papersize_pandas.parse(series, "mm")
+        self.assertEqual(list(frame.columns), ["width", "height"])
+        self.assertEqual(list(frame.index), list(series.index))
+        for value, (width, height) in zip(series, frame.itertuples(index=False)):
+            if pandas.isna(value):
+                self.assertTrue(pandas.isna(width) and pandas.isna(height))
+            else:
+                expected = papersize.parse_papersize(value, "mm")
+                self.assertAlmostEqual(width, float(expected[0]))
+                self.assertAlmostEqual(height, float(expected[1]))
+
+    def testErrors(self):
+        """Test invalid values."""
+        series = pandas.Series(["a4", "foo"])
+        self.assertRaises(papersize.CouldNotParse, papersize_pandas.parse, series)
+        frame = papersize_pandas.parse(series, errors="coerce")
+        self.assertTrue(pandas.isna(frame["width"][1]))
+        self.assertFalse(pandas.isna(frame["width"][0]))
+
+
+@unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+class TestArrow(unittest.TestCase):
+    """Test :mod:`papersize.arrow`."""
+
+    # pylint: disable = invalid-name
+
+    def testParse(self):
+        """Test :func:`papersize.arrow.parse`."""
+        array = pyarrow.chunked_array([["a4", None, "a5"], ["a5", "1cm 2cm"]])
+        table = papersize_arrow.parse(array, "cm")
+        self.assertEqual(table.column("width").num_chunks, 2)
+        self.assertEqual(
+            table.to_pydict(),
+            {
+                "width": [21.0, None, 14.8, 14.8, 1.0],
+                "height": [29.7, None, 21.0, 21.0, 2.0],
+            },
+        )
+
+    def testDictionary(self):
+        """Test dictionary-encoded arrays."""
+        array = pyarrow.array(["a4", "a4", None]).dictionary_encode()
+        self.assertEqual(
+            papersize_arrow.parse(array, "cm").to_pydict(),
+            {"width": [21.0, 21.0, None], "height": [29.7, 29.7, None]},
+        )
+
+    def testErrors(self):
+        """Test invalid values."""
+        array = pyarrow.array(["a4", "foo"])
+        self.assertRaises(papersize.CouldNotParse, papersize_arrow.parse, array)
+        self.assertEqual(
+            papersize_arrow.parse(array, "cm", errors="coerce").to_pydict(),
+            {"width": [21.0, None], "height": [29.7, None]},
+        )
+
+        # Unused dictionary items are not parsed
+        array = pyarrow.array(["a4", "foo", "a5"]).dictionary_encode()
+        array = array.filter(pyarrow.array([True, False, True]))
+        self.assertEqual(
+            papersize_arrow.parse(array, "cm").to_pydict(),
+            {"width": [21.0, 14.8], "height": [29.7, 21.0]},
+        )
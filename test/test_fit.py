@@ -0,0 +1,61 @@
+#!/usr/bin python
+
+# Copyright 2017 Louis Paternault
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of page fitting"""
+
+from __future__ import unicode_literals
+import unittest
+
+from papersize import fit
+
+
+class TestFit(unittest.TestCase):
+    """Test :mod:`papersize.fit`."""
+
+    # pylint: disable = invalid-name
+
+    def testFitPage(self):
+        """Test :func:`papersize.fit.fit_page`."""
+        for args, kwargs, result in [
+            (((100, 200), (200, 200)), {}, (1, False, 50, 0)),
+            (((200, 100), (100, 200)), {}, (1, True, 0, 0)),
+            (((100, 100), (200, 300)), {}, (2, False, 0, 50)),
+            (((100, 100), (200, 300)), {"upscale": False}, (1, False, 50, 100)),
+            (((400, 100), (220, 120)), {"margin": 10}, (0.5, False, 10, 35)),
+            (((100, 400), (220, 120)), {"margin": 10}, (0.5, True, 10, 35)),
+            (("1cm 2cm", "2cm 2cm"), {"unit": "cm"}, (1, False, 0.5, 0)),
+            (
+                ("1cm 2cm", "4cm 4cm"),
+                {"unit": "cm", "margin": "1cm"},
+                (1, False, 1.5, 1),
+            ),
+        ]:
+            placement = fit.fit_page(*args, **kwargs)
+            for left, right in zip(placement, result):
+                self.assertAlmostEqual(float(left), right)
+
+        self.assertRaises(ValueError, fit.fit_page, (1, 1), (10, 10), margin=5)
+        self.assertRaises(ValueError, fit.fit_page, "0pt 10pt", (10, 10))
+        self.assertRaises(ValueError, fit.fit_pages, [(1, 1), (-1, 1)], (10, 10))
+
+    def testFitPages(self):
+        """Test :func:`papersize.fit.fit_pages`."""
+        pages = ["a4", "A4", (595, 842), [842, 595], "a3", "letter"] * 10
+        self.assertEqual(
+            fit.fit_pages(pages, "a4", margin="1cm", upscale=False),
+            [fit.fit_page(page, "a4", margin="1cm", upscale=False) for page in pages],
+        )
@@ -0,0 +1,106 @@
+#!/usr/bin python
+
+# Copyright 2017 Louis Paternault
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of packed size arrays"""
+
+from __future__ import unicode_literals
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+try:
+    from papersize import packed
+except ImportError:
+    packed = None
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+
+@unittest.skipIf(packed is None, "papersize.packed requires Python 3")
+class TestSizeArray(unittest.TestCase):
+    """Test :class:`papersize.packed.SizeArray`."""
+
+    # pylint: disable = invalid-name
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testParse(self):
+        """Test :func:`papersize.packed.parse`."""
+        sizes = packed.parse(["a4", "1cm 2cm", "a4"], "mm")
+        self.assertEqual(len(sizes), 3)
+        self.assertEqual(list(sizes), [(210, 297), (10, 20), (210, 297)])
+        self.assertEqual(sizes[-1], (210, 297))
+        self.assertRaises(IndexError, sizes.__getitem__, 3)
+        self.assertEqual(
+            struct.unpack("6d", sizes.memoryview().tobytes()),
+            (210, 297, 10, 20, 210, 297),
+        )
+
+    def testInteger(self):
+        """Test integer arrays."""
+        sizes = packed.parse(["1.4mm 1.6mm"], "mm", typecode="q")
+        self.assertEqual(sizes.memoryview().format, "q")
+        self.assertEqual(list(sizes), [(1, 2)])
+        sizes.append((3, 4))
+        self.assertEqual(list(sizes), [(1, 2), (3, 4)])
+        self.assertRaises(ValueError, packed.SizeArray, typecode="f")
+
+    def testBuffer(self):
+        """Test :meth:`papersize.packed.SizeArray.write` and ``frombuffer``."""
+        sizes = packed.parse(["a4", "a5"], "cm", typecode="q")
+        buffer = bytearray(sizes.nbytes + 10)
+        self.assertEqual(sizes.write(buffer), sizes.nbytes)
+        copy = packed.SizeArray.frombuffer(buffer)
+        self.assertEqual((copy.unit, copy.typecode), ("cm", "q"))
+        self.assertEqual(list(copy), list(sizes))
+
+        # No copy
+        copy.data[0] = 42
+        self.assertEqual(packed.SizeArray.frombuffer(buffer)[0], (42, 30))
+
+        self.assertRaises(ValueError, packed.SizeArray.frombuffer, bytes(100))
+
+    def testFile(self):
+        """Test saving and loading files."""
+        filename = os.path.join(self.directory, "sizes")
+        sizes = packed.parse(["a4", "letter"] * 100, "in")
+        sizes.save(filename)
+        with packed.SizeArray.load(filename) as copy:
+            self.assertEqual(copy.unit, "in")
+            self.assertEqual(list(copy), list(sizes))
+        self.assertEqual(len(copy), 0)
+
+    @unittest.skipIf(shared_memory is None, "shared memory is not available")
+    def testSharedMemory(self):
+        """Test shared memory."""
+        sizes = packed.parse(["a4", "letter"], "bp")
+        block = sizes.to_shared_memory()
+        try:
+            with packed.SizeArray.from_shared_memory(block.name) as copy:
+                self.assertEqual(list(copy), list(sizes))
+        finally:
+            block.close()
+            block.unlink()
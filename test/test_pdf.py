@@ -0,0 +1,191 @@
+#!/usr/bin python
+
+# Copyright 2017 Louis Paternault
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of PDF scanning"""
+
+from __future__ import unicode_literals
+from decimal import Decimal
+import os
+import shutil
+import tempfile
+import unittest
+import warnings
+import zlib
+
+from papersize import pdf
+
+PDF = b"""%PDF-1.4
+1 0 obj << /Type /Catalog /Pages 2 0 R >> endobj
+3 0 obj << /Type /Page /Parent 2 0 R >> endobj
+4 0 obj << /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] >> endobj
+5 0 obj << /Type /Page /Parent 2 0 R /MediaBox [0 0 841.89 595.276]
+/CropBox [10 10 110 210] >> endobj
+6 0 obj << /Length 20 >> stream
+/MediaBox [0 0 1 1]
+endstream endobj
+2 0 obj << /Type /Pages /Kids [3 0 R 4 0 R 5 0 R] /Count 3
+/MediaBox [0 0 595.276 841.89] >> endobj
+7 0 obj << /Type /Page /Parent 2 0 R /MediaBox [-100 -100 100 100] >> endobj
+trailer << /Root 1 0 R >>
+%%EOF
+"""
+
+
+# Page tree with cycles
+CYCLE = b"""%PDF-1.4
+2 0 obj <</Type/Pages/Parent 3 0 R>> endobj
+3 0 obj <</Type/Pages/Parent 2 0 R>> endobj
+4 0 obj <</Type/Page/Parent 2 0 R>> endobj
+5 0 obj <</Type/Page/Parent 5 0 R/MediaBox [0 0 612 792]>> endobj
+6 0 obj <</Type/Page/Parent 6 0 R>> endobj
+"""
+
+
+def _object_stream(number, objects, filters=b"/FlateDecode"):
+    """Return an object stream containing ``objects`` (couples ``(number,
+    body)``).
+    """
+    header = b""
+    data = b""
+    for obj, body in objects:
+        header += "{} {} ".format(obj, len(data)).encode("ascii")
+        data += body + b"\n"
+    if filters == b"/FlateDecode":
+        data = zlib.compress(header + data)
+    else:
+        data = header + data
+    return (
+        "{} 0 obj <</Type/ObjStm/N {}/First {}/Filter".format(
+            number, len(objects), len(header)
+        ).encode("ascii")
+        + filters
+        + b">> stream\n"
+        + data
+        + b"\nendstream endobj\n"
+    )
+
+
+# Compressed objects, incremental update, and malformed box
+OBJSTM = (
+    b"%PDF-1.5\n"
+    + _object_stream(
+        1,
+        [
+            (3, b"<</Type/Page/Parent 2 0 R/MediaBox [0 0 612 792]>>"),
+            (2, b"<</Type/Pages/Kids [3 0 R 4 0 R 5 0 R]/MediaBox [0 0 595 842]>>"),
+            (4, b"<</Type/Page/Parent 2 0 R>>"),
+        ],
+    )
+    + b"5 0 obj <</Type/Page/Parent 2 0 R/MediaBox [0 0 . 1.2.3]>> endobj\n"
+    + b"%%EOF\n"
+    + b"4 0 obj <</Type/Page/Parent 2 0 R/MediaBox [0 0 612 792]>> endobj\n"
+    + _object_stream(6, [(7, b"<</Type/Page/MediaBox [0 0 10 10]>>")], b"/LZWDecode")
+    + b"%%EOF\n"
+)
+
+
+class TestPDF(unittest.TestCase):
+    """Test :mod:`papersize.pdf`."""
+
+    # pylint: disable = invalid-name
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, "test.pdf")
+        with open(self.filename, "wb") as file:
+            file.write(PDF)
+        os.mkdir(os.path.join(self.directory, "sub"))
+        with open(os.path.join(self.directory, "sub", "empty.PDF"), "wb"):
+            pass
+        with open(os.path.join(self.directory, "sub", "ignored.txt"), "wb") as file:
+            file.write(PDF)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testIterPages(self):
+        """Test :func:`papersize.pdf.iter_pages`."""
+        pages = list(pdf.iter_pages(self.filename, "bp"))
+        self.assertEqual(
+            [(page.index, page.width, page.height, page.name) for page in pages],
+            [
+                (0, Decimal("595.276"), Decimal("841.89"), "a4"),
+                (1, 612, 792, "letter"),
+                (2, Decimal("841.89"), Decimal("595.276"), "a4"),
+                (3, 200, 200, None),
+            ],
+        )
+        self.assertTrue(all(page.filename == self.filename for page in pages))
+
+    def testCropBox(self):
+        """Test the ``CropBox`` argument."""
+        self.assertEqual(
+            [
+                (page.index, page.width, page.height)
+                for page in pdf.iter_pages(self.filename, "bp", box="CropBox")
+            ],
+            [
+                (0, Decimal("595.276"), Decimal("841.89")),
+                (1, 612, 792),
+                (2, 100, 200),
+                (3, 200, 200),
+            ],
+        )
+
+    def testCycle(self):
+        """Test page trees with cycles."""
+        with open(self.filename, "wb") as file:
+            file.write(CYCLE)
+        self.assertEqual(
+            [(page.index, page.name) for page in pdf.iter_pages(self.filename)],
+            [(1, "letter")],
+        )
+
+    def testObjectStream(self):
+        """Test compressed objects, and objects defined several times."""
+        with open(self.filename, "wb") as file:
+            file.write(OBJSTM)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            self.assertEqual(
+                [(page.index, page.name) for page in pdf.iter_pages(self.filename)],
+                [(0, "letter"), (1, "letter"), (2, "a4")],
+            )
+        self.assertEqual(len(caught), 1)
+
+    def testTolerance(self):
+        """Test the ``tolerance`` argument."""
+        self.assertEqual(
+            [page.name for page in pdf.iter_pages(self.filename, tolerance=0)],
+            [None, "letter", None, None],
+        )
+
+    def testScan(self):
+        """Test :func:`papersize.pdf.scan`."""
+        for processes in (1, 2):
+            self.assertEqual(
+                sorted(
+                    (page.filename, page.index, page.name)
+                    for page in pdf.scan([self.directory], processes=processes)
+                ),
+                [
+                    (self.filename, 0, "a4"),
+                    (self.filename, 1, "letter"),
+                    (self.filename, 2, "a4"),
+                    (self.filename, 3, None),
+                ],
+            )
@@ -0,0 +1,82 @@
+#!/usr/bin python
+
+# Copyright 2017 Louis Paternault
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of poster tiling"""
+
+from __future__ import unicode_literals
+import unittest
+
+from papersize import poster
+
+
+class TestPoster(unittest.TestCase):
+    """Test :mod:`papersize.poster`."""
+
+    # pylint: disable = invalid-name
+
+    def testPlanTiles(self):
+        """Test :func:`papersize.poster.plan_tiles`."""
+        for args, kwargs, result in [
+            (((50, 50), (100, 200)), {}, (False, 1, 1, 17500)),
+            (((400, 100), (100, 200)), {}, (True, 2, 1, 0)),
+            (((400, 100), (200, 100)), {}, (False, 2, 1, 0)),
+            (((400, 400), (100, 100)), {}, (False, 4, 4, 0)),
+            (((100, 100), (60, 40)), {"overlap": 10}, (False, 2, 3, 4400)),
+            (((100, 100), (60, 40)), {"margin": 5}, (False, 2, 4, 9200)),
+            (
+                ((100, 100), (60, 40)),
+                {"overlap": 10, "minimize": "waste"},
+                (False, 2, 3, 4400),
+            ),
+        ]:
+            tiling = poster.plan_tiles(*args, **kwargs)
+            self.assertEqual(
+                (tiling.rotated, tiling.columns, tiling.rows, tiling.waste), result
+            )
+
+        self.assertEqual(
+            list(poster.plan_tiles((100, 100), (60, 40), overlap=10).tiles()),
+            [(0, 0), (50, 0), (0, 30), (50, 30), (0, 60), (50, 60)],
+        )
+        self.assertRaises(ValueError, poster.plan_tiles, (1, 1), (10, 10), margin=5)
+        self.assertRaises(ValueError, poster.plan_tiles, (1, 1), (10, 10), overlap=10)
+        self.assertRaises(ValueError, poster.plan_tiles, (1, 1), (10, 10), minimize="x")
+
+    def testPlanPoster(self):
+        """Test :func:`papersize.poster.plan_poster`."""
+        sheets = [(100, 100), (150, 150), (300, 300)]
+        tiling = poster.plan_poster((300, 300), sheets)
+        self.assertEqual(
+            (tiling.sheet, tiling.sheets, tiling.waste), ((300, 300), 1, 0)
+        )
+        tiling = poster.plan_poster((310, 300), sheets)
+        self.assertEqual((tiling.sheet, tiling.sheets), ((300, 300), 2))
+        tiling = poster.plan_poster((310, 300), sheets, minimize="waste")
+        self.assertEqual((tiling.sheet, tiling.sheets), ((100, 100), 12))
+        self.assertRaises(ValueError, poster.plan_poster, (1, 1), [])
+
+    def testPlanPosters(self):
+        """Test :func:`papersize.poster.plan_posters`."""
+        posters = ["a0", "A0", "4a0", [2384, 3370], "arche"] * 10
+        sheets = ["a4", "a3", "letter"]
+        self.assertEqual(
+            poster.plan_posters(posters, sheets, margin="5mm", overlap="1cm"),
+            [
+                poster.plan_poster(item, sheets, margin="5mm", overlap="1cm")
+                for item in posters
+            ],
+        )
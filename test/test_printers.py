@@ -0,0 +1,133 @@
+#!/usr/bin python
+
+# Copyright 2017 Louis Paternault
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of printer sizes importers"""
+
+from __future__ import unicode_literals
+import os
+import shutil
+import tempfile
+import unittest
+
+import papersize
+from papersize import printers
+
+PPD = """*PPD-Adobe: "4.3"
+*OpenUI *PageSize/Media Size: PickOne
+*PageSize A4/A4: "<</PageSize[595 842]>>setpagedevice"
+*CloseUI: *PageSize
+*PaperDimension Letter/US Letter: "612 792"
+*PaperDimension A4/A4 210x297mm: "595.28 841.89"
+*PaperDimension Custom.Stock/Custom stock: "500 700"
+*ImageableArea Letter/US Letter: "18 36 594 756"
+*ImageableArea A4/A4: "18.0 36.0 577.28 805.89"
+"""
+
+GS = """% Comment
+/letter {/letter 612 792 //.setpagesize exec} bind def
+/ledger {1224 792 //.setpagesize exec} bind def
+/gsstock {/gsstock 300 400 //.setpagesize exec 25 25 275 375 .setimageablearea} bind def
+/a4small {a4 25 25 570 817 .setimageablearea} bind def
+"""
+
+
+class TestPrinters(unittest.TestCase):
+    """Test :mod:`papersize.printers`."""
+
+    # pylint: disable = invalid-name
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.ppd = os.path.join(self.directory, "printer.ppd")
+        with open(self.ppd, "wb") as file:
+            file.write(PPD.encode("latin1"))
+        self.gs = os.path.join(self.directory, "gs_statd.ps")
+        with open(self.gs, "wb") as file:
+            file.write(GS.encode("latin1"))
+
+    def tearDown(self):
+        for item in papersize.CATALOGS:
+            item.close()
+        del papersize.CATALOGS[:]
+        printers._LOADED.clear()  # pylint: disable = protected-access
+        shutil.rmtree(self.directory)
+
+    def testPPD(self):
+        """Test :func:`papersize.printers.load_ppd`."""
+        sizes = printers.load_ppd(self.ppd)
+        self.assertEqual(
+            dict(sizes.items()),
+            {
+                "letter": "612bp x 792bp",
+                "a4": "595.28bp x 841.89bp",
+                "custom.stock": "500bp x 700bp",
+            },
+        )
+        self.assertEqual(papersize.parse_papersize("Custom.Stock", "bp"), (500, 700))
+        self.assertEqual(papersize.CATALOGS, [sizes])
+
+    def testGhostscript(self):
+        """Test :func:`papersize.printers.load_ghostscript`."""
+        sizes = printers.load_ghostscript(self.gs, register=False)
+        self.assertEqual(
+            dict(sizes.items()),
+            {
+                "letter": "612bp x 792bp",
+                "ledger": "1224bp x 792bp",
+                "gsstock": "300bp x 400bp",
+            },
+        )
+        self.assertEqual(papersize.CATALOGS, [])
+
+    def testImageableAreas(self):
+        """Test :func:`papersize.printers.read_imageable_areas`."""
+        areas = printers.read_imageable_areas(self.ppd, "bp")
+        self.assertEqual(areas["letter"], (18, 36, 594, 756))
+        self.assertEqual(sorted(areas), ["a4", "letter"])
+
+    def testCache(self):
+        """Test that files are only parsed again when modified."""
+        cache_directory = os.path.join(self.directory, "cache")
+        os.mkdir(cache_directory)
+        first = printers.load_ppd(self.ppd, cache_directory=cache_directory)
+        self.assertIs(printers.load_ppd(self.ppd), first)
+        self.assertEqual(len(os.listdir(cache_directory)), 1)
+
+        # Cached on disk
+        printers._LOADED.clear()  # pylint: disable = protected-access
+        del papersize.CATALOGS[:]
+        second = printers.load_ppd(self.ppd, cache_directory=cache_directory)
+        self.assertEqual(dict(second.items()), dict(first.items()))
+        self.assertEqual(len(os.listdir(cache_directory)), 1)
+
+        # Temporary file of another process
+        temporary = os.path.join(
+            cache_directory, "{}.99999.tmp".format(os.listdir(cache_directory)[0])
+        )
+        with open(temporary, "wb"):
+            pass
+
+        # Modified file
+        with open(self.ppd, "ab") as file:
+            file.write(b'*PaperDimension New/New: "1 2"\n')
+        third = printers.load_ppd(self.ppd, cache_directory=cache_directory)
+        self.assertIn("new", third)
+        self.assertEqual(papersize.CATALOGS, [third])
+        # Previous version is closed, and removed from the cache
+        self.assertRaises(ValueError, lambda: dict(second.items()))
+        self.assertEqual(len(os.listdir(cache_directory)), 2)
+        self.assertTrue(os.path.exists(temporary))
@@ -0,0 +1,134 @@
+#!/usr/bin python
+
+# Copyright 2017 Louis Paternault
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests of trace recording and replay"""
+
+from __future__ import unicode_literals
+from decimal import Decimal
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+import papersize
+from papersize import trace
+
+
+class TestTrace(unittest.TestCase):
+    """Test :mod:`papersize.trace`."""
+
+    # pylint: disable = invalid-name
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _record(self, filename, **kwargs):
+        """Record some calls into ``filename``."""
+        with trace.Recorder(os.path.join(self.directory, filename), **kwargs):
+            papersize.parse_papersize("a4", "mm")
+            papersize.parse_couple("1cm 2cm", unit="cm")
+            papersize.parse_length("3in")
+            papersize.convert_length(Decimal("2.54"), "cm", "in")
+            self.assertRaises(papersize.CouldNotParse, papersize.parse_papersize, "foo")
+
+    def testRecord(self):
+        """Test :class:`papersize.trace.Recorder`."""
+        self._record("trace.jsonl", buffer_size=2)
+        for name in trace.FUNCTIONS:
+            self.assertFalse(hasattr(getattr(papersize, name), "__wrapped__"))
+
+        with open(os.path.join(self.directory, "trace.jsonl")) as file:
+            records = [json.loads(line) for line in file]
+        # Nested calls are not recorded
+        self.assertEqual(
+            [record[0] for record in records],
+            [
+                "parse_papersize",
+                "parse_couple",
+                "parse_length",
+                "convert_length",
+                "parse_papersize",
+            ],
+        )
+        self.assertEqual(records[1][2], {"unit": "cm"})
+        self.assertEqual(records[4][3], {"error": "CouldNotParse"})
+
+        self._record("empty.jsonl", sample=0)
+        with open(os.path.join(self.directory, "empty.jsonl")) as file:
+            self.assertEqual(file.read(), "")
+
+    def testThreads(self):
+        """Test that no record is lost when recording from several threads."""
+
+        def target():
+            """Make some calls."""
+            for __ in range(500):
+                papersize.parse_length("1cm")
+
+        filename = os.path.join(self.directory, "trace.jsonl")
+        recorder = trace.Recorder(filename, buffer_size=7)
+        recorder.stop()  # Not started: nothing is done
+        if hasattr(sys, "getswitchinterval"):
+            # Switch threads often, to make race conditions more likely
+            interval = sys.getswitchinterval()
+            sys.setswitchinterval(1e-6)
+        try:
+            with recorder:
+                threads = [threading.Thread(target=target) for __ in range(8)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+        finally:
+            if hasattr(sys, "getswitchinterval"):
+                sys.setswitchinterval(interval)
+        recorder.stop()
+        with open(filename) as file:
+            self.assertEqual(len(file.readlines()), 4000)
+
+    def testReplay(self):
+        """Test :func:`papersize.trace.replay`."""
+        self._record("trace.jsonl.gz")
+        filename = os.path.join(self.directory, "trace.jsonl.gz")
+
+        report = trace.replay(filename, repeat=3)
+        self.assertEqual((report.calls, report.skipped), (15, 0))
+        self.assertEqual(report.mismatches, [])
+        self.assertEqual(sorted(report.latencies), [50, 90, 99, 99.9])
+        self.assertTrue(report.latencies[50] <= report.latencies[99.9])
+        self.assertTrue(report.throughput > 0)
+
+        class Backend(object):
+            """Backend with a single (wrong) function."""
+
+            @staticmethod
+            def parse_length(string, unit="pt"):
+                """Always return 0."""
+                # pylint: disable = unused-argument
+                return Decimal(0)
+
+        report = trace.replay(filename, Backend())
+        self.assertEqual((report.calls, report.skipped), (1, 4))
+        self.assertEqual(len(report.mismatches), 1)
+        self.assertEqual(report.mismatches[0][0], "parse_length")
+        self.assertEqual(report.mismatches[0][4], Decimal(0))